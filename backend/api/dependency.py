@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timezone
 from fastapi import Request, HTTPException, Depends, status
 
@@ -5,8 +6,11 @@ from backend.enums.role import Role
 from backend.schemas.db.user import UserDB
 from backend.services.sqlstore.database_session import get_session
 from backend.services.sqlstore.models.sessions.repository import SessionRepository
-from backend.services.sqlstore.models.users.repository import UserRepository
 from backend.services.utils.config import Config
+from backend.services.utils.ttl_cache import TTLCache
+
+
+auth_cache = TTLCache(maxsize=Config.AUTH_CACHE_SIZE, ttl=Config.AUTH_CACHE_TTL)
 
 
 async def get_current_user(request: Request) -> UserDB:
@@ -18,31 +22,43 @@ async def get_current_user(request: Request) -> UserDB:
             detail="Unauthorized"
         )
 
+    user = auth_cache.get(session_uuid)
+    if user:
+        return user
+
     async with get_session() as db_session:
         repo: SessionRepository = SessionRepository(db_session)
-        session = await repo.get_one(**{
-            "uuid": session_uuid
-        })
+        row = await repo.get_user_by_session(session_uuid)
 
-    if not session:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Unauthorized"
         )
 
-    if session.expires_at < datetime.now(timezone.utc):
+    user, expires_at = row
+    lifetime = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    if lifetime <= 0:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Unauthorized"
         )
 
-    async with get_session() as db_session:
-        repo: UserRepository = UserRepository(db_session)
-        user = await repo.get_one(**{
-            "id": session.user_id
-        })
+    user = UserDB(id=user.id, login=user.login, password=user.password, name=user.name, role=user.role)
+    # Never outlive the session itself.
+    auth_cache.set(session_uuid, user, ttl=lifetime)
+    return user
 
-    return UserDB(id=user.id, login=user.login, password=user.password, name=user.name, role=user.role)
+
+def invalidate_session(session_uuid: str) -> None:
+    auth_cache.pop(session_uuid)
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Drop every cached session of a user, e.g. after the user was deleted or the role changed.
+    """
+    auth_cache.evict(lambda _, user: user.id == user_id)
 
 
 def require_role(*allowed_roles: Role):
@@ -55,3 +71,15 @@ def require_role(*allowed_roles: Role):
         return user
 
     return checker
+
+
+def check_uuid(value: str | None) -> str | None:
+    """
+    Reject a malformed UUID query parameter with a 400 before it reaches the database.
+    """
+    if value is not None:
+        try:
+            uuid.UUID(value)
+        except (ValueError, AttributeError, TypeError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bad_request")
+    return value
@@ -1,9 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.api.routers import projects, users, auth, notifications, events
+from backend.api.metrics import MetricsMiddleware
+from backend.api.routers import projects, users, auth, notifications, events, issues, stats, export, imports, metrics
+from backend.services.ingest.buffer import ingest_buffer
+from backend.services.ingest.project_keys import project_keys
+from backend.services.notifications.coalescing import notification_coalescer
+from backend.services.notifications.dispatcher import webhook_dispatcher
+from backend.services.notifications.outbox import outbox_worker
 from backend.services.sqlstore.database_init import init_db
-from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.database_session import get_session, dispose_engine
 from backend.services.utils.config import Config
+from backend.services.utils.hash_creator import shutdown_executor
 from backend.services.utils.logger import Logger
 from contextlib import asynccontextmanager
 
@@ -26,12 +33,24 @@ async def lifespan(_):
         if not user:
             user = await repo.add_one(**{
                 "login": Config.ADMIN_LOGIN,
-                "password": get_password_hash(Config.ADMIN_PASSWORD),
+                "password": await get_password_hash(Config.ADMIN_PASSWORD),
                 "name": Config.ADMIN_NAME,
                 "role": "admin"
             })
             logger.info(f"Admin {Config.ADMIN_NAME} with id {user} was added to DB")
+    await project_keys.start()
+    await ingest_buffer.start()
+    await webhook_dispatcher.start()
+    await outbox_worker.start()
+    await notification_coalescer.start()
     yield
+    await ingest_buffer.stop()
+    await notification_coalescer.stop()
+    await outbox_worker.stop()
+    await webhook_dispatcher.stop()
+    await project_keys.stop()
+    await dispose_engine()
+    shutdown_executor()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -42,10 +61,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Estimate"],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(projects.router, prefix="/api/projects", tags=["projects"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(notifications.router, prefix="/api/notifications", tags=["notifications"])
 app.include_router(events.router, prefix="/api", tags=["events"])
+app.include_router(issues.router, prefix="/api/issues", tags=["issues"])
+app.include_router(stats.router, prefix="/api/stats", tags=["stats"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(imports.router, prefix="/api/import", tags=["import"])
+app.include_router(metrics.router, tags=["metrics"])
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Request, Response, Depends, HTTPException, status
 from datetime import datetime, timedelta, timezone
 from backend.schemas.api.login import LoginRequest
@@ -8,7 +10,7 @@ from backend.services.utils.hash_creator import check_password
 from backend.services.utils.uuid_creator import get_uuid
 from backend.services.utils.config import Config
 from backend.services.utils.logger import Logger
-from backend.api.dependency import require_role
+from backend.api.dependency import invalidate_session, require_role
 from backend.enums.role import Role
 from backend.schemas.db.user import UserDB
 
@@ -22,7 +24,12 @@ async def login_user(payload: LoginRequest, request: Request, response: Response
         repo = UserRepository(db_session)
         user = await repo.get_one(login=payload.login)
 
-    if not user or not check_password(payload.password, user.password):
+    try:
+        valid = bool(user) and await check_password(payload.password, user.password)
+    except asyncio.QueueFull:
+        logger.error(f"Password hashing queue is full, login of {payload.login} was rejected")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Service_unavailable")
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
     session_uuid = get_uuid()
@@ -53,12 +60,14 @@ async def login_user(payload: LoginRequest, request: Request, response: Response
     return {"message": "ok"}
 
 
+@router.post("/logout")
 async def logout(request: Request, response: Response):
     session_uuid = request.cookies.get(Config.SESSION_COOKIE_NAME)
     if session_uuid:
         async with get_session() as db_session:
             repo = SessionRepository(db_session)
             await repo.delete_one(uuid=session_uuid)
+        invalidate_session(session_uuid)
         response.delete_cookie(Config.SESSION_COOKIE_NAME)
     return {"message": "logged out"}
 
@@ -1,18 +1,28 @@
-from fastapi import APIRouter, HTTPException, Request, status, Depends
-from fastapi.responses import JSONResponse
+import asyncio
+import base64
+import math
+import time
+from datetime import datetime
 
-from backend.api.dependency import require_role
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from backend.api.dependency import check_uuid, require_role
 from backend.enums.role import Role
 from backend.schemas.api.link import EventLinkResponse
-from backend.services.notifications.base import WebhookSender
-from backend.services.notifications.mattermost import MattermostWebhookSender
-from backend.services.notifications.slack import SlackWebhookSender
+from backend.services.ingest.buffer import ingest_buffer
+from backend.services.ingest.project_keys import normalize_key, project_keys
+from backend.services.ingest.rate_limit import rate_limiter
+from backend.services.notifications.coalescing import notification_coalescer
+from backend.services.notifications.dispatcher import webhook_dispatcher
+from backend.services.notifications.outbox import outbox_worker
 from backend.services.sqlstore.database_session import get_session
 from backend.services.sqlstore.models.events.repository import EventRepository
-from backend.services.sqlstore.models.notifications.repository import NotificationRepository
 from backend.services.utils.config import Config
+from backend.services.utils.envelope import EnvelopeError, EnvelopeTooLarge, UnsupportedEncoding
 from backend.services.utils.logger import Logger
-from backend.services.utils.sentry import Sentry
+from backend.services.utils.metrics import ENVELOPES, EVENTS_PARSED, PARSE_SECONDS, project_label
+from backend.services.utils.sentry import RateLimited, Sentry, UnknownProject
 
 router = APIRouter()
 logger = Logger(__name__)
@@ -26,65 +36,158 @@ async def get_event_link(project_uuid: str):
 
 @router.post("/{project_id}/envelope/")
 async def envelope_endpoint(request: Request, project_id: int):
-    envelope = await Sentry.parse_as_model(request)
-
-    if not envelope:
-        logger.error(f"Empty envelope received for project {project_id}")
+    # Rejected envelopes are counted under one "unknown" project until their key is
+    # known, so arbitrary keys cannot grow the label set.
+    started = time.perf_counter()
+    try:
+        events = await Sentry.parse_as_models(request)
+    except RateLimited as e:
+        ENVELOPES.labels(project_label(e.project_uuid), "rate_limited").inc()
+        retry_after = str(math.ceil(e.retry_after))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too_many_requests",
+            headers={
+                "Retry-After": retry_after,
+                # retry_after:categories:scope, no categories means every kind of item.
+                "X-Sentry-Rate-Limits": f"{retry_after}::project",
+            },
+        )
+    except UnknownProject as e:
+        ENVELOPES.labels("unknown", "unknown_project").inc()
+        logger.warning(f"Envelope for project {project_id} rejected: {e}")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    except EnvelopeTooLarge:
+        ENVELOPES.labels("unknown", "too_large").inc()
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Payload_too_large")
+    except UnsupportedEncoding:
+        ENVELOPES.labels("unknown", "unsupported").inc()
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Unsupported_media_type")
+    except EnvelopeError as e:
+        ENVELOPES.labels("unknown", "malformed").inc()
+        logger.error(f"Malformed envelope received for project {project_id}: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bad_request")
 
-    async with get_session() as db_session:
-        repo = EventRepository(db_session)
-        event = await repo.add_one(**envelope.model_dump())
-        logger.info(f"Event with uuid {event} was added to DB")
+    PARSE_SECONDS.observe(time.perf_counter() - started)
 
-    async with get_session() as db_session:
-        repo = NotificationRepository(db_session)
-        notifications = await repo.get_all(
-            **{
-                "project_uuid": envelope.project_uuid
-            }
-        )
+    if events is None:
+        ENVELOPES.labels("unknown", "empty").inc()
+        logger.error(f"Empty envelope received for project {project_id}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bad_request")
 
-    for notification in notifications:
-        event_data = {
-            "uuid": envelope.uuid,
-            "exception_type": envelope.type,
-            "exception_message": envelope.value,
-            "timestamp": envelope.timestamp,
-            "path": envelope.abs_path,
-            "server_name": envelope.server_name,
-            "severity": envelope.level,
-            "line": envelope.lineno
-        }
-        if notification.get("type") == "mattermost":
-            webhook = MattermostWebhookSender(notification.get("url"))
-            event_data["channel"] = notification.get("channel")
-            event_data["username"] = notification.get("username")
-        elif notification.get("type") == "slack":
-            webhook = SlackWebhookSender(notification.get("url"))
-            event_data["channel"] = notification.get("channel")
-            event_data["username"] = notification.get("username")
-        else:
-            webhook = WebhookSender(notification.get("url"))
-
-        await webhook.send_text(event_data)
+    project = project_label(events[0].project_uuid) if events else "unknown"
+    if events:
+        EVENTS_PARSED.labels(project).inc(len(events))
+        try:
+            ingest_buffer.put(*events)
+        except asyncio.QueueFull:
+            ENVELOPES.labels(project, "queue_full").inc()
+            logger.error(f"Ingest buffer is full, {len(events)} events for project {project_id} were rejected")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Service_unavailable")
+        logger.info(f"{len(events)} events from envelope were queued for DB")
+    ENVELOPES.labels(project, "accepted").inc()
 
     return JSONResponse(
         status_code=status.HTTP_202_ACCEPTED,
         content={
             "status": "received",
             "project_id": project_id,
+            "accepted": len(events),
         }
     )
 
 
 @router.get("/events")
-async def get_events(user=Depends(require_role(Role.user, Role.project_manager, Role.admin))):
+async def get_events(
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: str | None = None,
+        project_uuid: str | None = None,
+        level: str | None = None,
+        exception_type: str | None = Query(None, alias="type"),
+        server_name: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        user=Depends(require_role(Role.user, Role.project_manager, Role.admin))
+):
+    filters = {
+        "user_id": user.id if user.role == "user" else None,
+        "project_uuid": check_uuid(project_uuid),
+        "level": level,
+        "exception_type": exception_type,
+        "server_name": server_name,
+        "since": since,
+        "until": until,
+    }
+    async with get_session() as db_session:
+        repo = EventRepository(db_session)
+        events, next_cursor = await repo.get_events_page(limit, decode_cursor(cursor), **filters)
+        estimated_total = await repo.estimate_count(**filters)
+
+    headers = {"X-Total-Estimate": str(estimated_total)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = encode_cursor(next_cursor)
+    # Plain dicts of summary columns, serialized by orjson without the jsonable_encoder pass.
+    return ORJSONResponse(events, headers=headers)
+
+
+@router.get("/events/search")
+async def search_events(
+        q: str = Query(..., min_length=3, max_length=200),
+        limit: int = Query(50, ge=1, le=200),
+        offset: int = Query(0, ge=0, le=10000),
+        project_uuid: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        user=Depends(require_role(Role.user, Role.project_manager, Role.admin))
+):
+    filters = {
+        "user_id": user.id if user.role == "user" else None,
+        "project_uuid": check_uuid(project_uuid),
+        "since": since,
+        "until": until,
+    }
+    async with get_session() as db_session:
+        repo = EventRepository(db_session)
+        events = await repo.search(q, limit, offset, **filters)
+
+    return ORJSONResponse(events)
+
+
+@router.get("/events/{event_uuid}")
+async def get_event(event_uuid: str, user=Depends(require_role(Role.user, Role.project_manager, Role.admin))):
+    if normalize_key(event_uuid) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not_found")
     async with get_session() as db_session:
         repo = EventRepository(db_session)
-        if user.role == "user":
-            events = await repo.get_events_for_user(user.id)
-        else:
-            events = await repo.get_events_with_project_title()
+        event = await repo.get_event(event_uuid, user_id=user.id if user.role == "user" else None)
+
+    if event is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not_found")
+    return ORJSONResponse(event)
+
+
+def encode_cursor(cursor: tuple[datetime, str]) -> str:
+    timestamp, uuid = cursor
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{uuid}".encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> tuple[datetime, str] | None:
+    if not cursor:
+        return None
+    try:
+        timestamp, uuid = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), check_uuid(uuid)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bad_request")
+
 
-    return events
+@router.get("/ingest/stats")
+async def get_ingest_stats(user=Depends(require_role(Role.admin))):
+    return {
+        **ingest_buffer.stats(),
+        "webhooks": webhook_dispatcher.stats(),
+        "outbox": outbox_worker.stats(),
+        "coalescing": notification_coalescer.stats(),
+        "project_keys": project_keys.stats(),
+        "rate_limits": rate_limiter.stats(),
+    }
@@ -0,0 +1,112 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Literal
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from backend.api.dependency import check_uuid, require_role
+from backend.enums.role import Role
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.events.model import Event
+from backend.services.sqlstore.models.events.repository import EventRepository
+from backend.services.utils.config import Config
+from backend.services.utils.logger import Logger
+
+router = APIRouter()
+logger = Logger(__name__)
+
+EXPORT_COLUMNS = [column.name for column in Event.__table__.columns if not column.info.get("internal")]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+@router.get("/events")
+async def export_events(
+        export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+        fields: list[str] | None = Query(None),
+        compress: bool = Query(False, alias="gzip"),
+        project_uuid: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        user=Depends(require_role(Role.user, Role.project_manager, Role.admin))
+):
+    """
+    Stream the matching events as NDJSON or CSV, optionally gzip-compressed.
+    """
+    columns = fields or EXPORT_COLUMNS
+    if any(column not in EXPORT_COLUMNS for column in columns):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bad_request")
+
+    filters = {
+        "user_id": user.id if user.role == "user" else None,
+        "project_uuid": check_uuid(project_uuid),
+        "since": since,
+        "until": until,
+    }
+    if export_format == "ndjson":
+        body = _export(columns, filters, _encode_ndjson)
+    else:
+        body = _export(columns, filters, _encode_csv, header=_csv_line(columns))
+
+    filename = f"events.{export_format}"
+    media_type = MEDIA_TYPES[export_format]
+    if compress:
+        body = _gzip(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _export(columns: list[str], filters: dict, encode, header: bytes = b"") -> AsyncIterator[bytes]:
+    # The session is opened here rather than in the handler, because the body is only
+    # produced after the handler has returned.
+    rows = 0
+    if header:
+        yield header
+    async with get_session() as db_session:
+        repo = EventRepository(db_session)
+        async for partition in repo.stream_events(columns, Config.EXPORT_BATCH_SIZE, **filters):
+            rows += len(partition)
+            yield encode(partition, columns)
+    logger.info(f"Exported {rows} events")
+
+
+def _encode_ndjson(partition, columns: list[str]) -> bytes:
+    return b"".join(orjson.dumps(dict(row)) + b"\n" for row in partition)
+
+
+def _encode_csv(partition, columns: list[str]) -> bytes:
+    return b"".join(_csv_line([_csv_value(row[column]) for column in columns]) for row in partition)
+
+
+def _csv_line(values: list) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue().encode()
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
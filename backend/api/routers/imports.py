@@ -0,0 +1,69 @@
+from typing import AsyncIterator, Literal
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from backend.api.dependency import require_role
+from backend.enums.role import Role
+from backend.services.ingest.importer import EventImporter
+from backend.services.ingest.project_keys import project_keys
+from backend.services.utils.config import Config
+from backend.services.utils.envelope import (
+    EnvelopeError, EnvelopeTooLarge, UnsupportedEncoding, get_decompressor, iter_decompressed,
+)
+from backend.services.utils.logger import Logger
+
+router = APIRouter()
+logger = Logger(__name__)
+
+
+@router.post("/events")
+async def import_events(
+        request: Request,
+        project_uuid: str,
+        kind: Literal["events", "envelopes"] = "events",
+        user=Depends(require_role(Role.project_manager, Role.admin))
+):
+    """
+    Import an NDJSON upload of events or Sentry envelopes into a project.
+    The body may be compressed with any Content-Encoding the envelope endpoint accepts.
+
+    The response is NDJSON streamed while the import runs: line errors and progress
+    after every written batch, then a last line with "status" "imported" or "failed".
+    """
+    if not project_keys.is_known(project_uuid):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not_found")
+    content_encoding = request.headers.get("content-encoding")
+    try:
+        get_decompressor(content_encoding)
+    except UnsupportedEncoding:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Unsupported_media_type")
+
+    chunks = iter_decompressed(request.stream(), content_encoding, Config.IMPORT_MAX_SIZE)
+    importer = EventImporter(
+        project_uuid, kind, Config.IMPORT_BATCH_SIZE, Config.IMPORT_MAX_ERRORS, Config.IMPORT_MAX_LINE_SIZE
+    )
+    logger.info(f"Import of {kind} into project {project_uuid} was started by user {user.name}")
+    return StreamingResponse(_import(importer, chunks), media_type="application/x-ndjson")
+
+
+async def _import(importer: EventImporter, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # Failures after the response has started can only be reported in the body.
+    try:
+        async for message in importer.stream(chunks):
+            yield orjson.dumps(message) + b"\n"
+    except EnvelopeTooLarge:
+        yield _failed(importer, "Payload_too_large")
+        return
+    except EnvelopeError as e:
+        logger.error(f"Import into project {importer.project_uuid} failed after {importer.lines} lines: {e}")
+        yield _failed(importer, "Bad_request")
+        return
+
+    logger.info(f"Import into project {importer.project_uuid} finished: {importer.imported} events, "
+                f"{importer.errors} errors")
+
+
+def _failed(importer: EventImporter, error: str) -> bytes:
+    return orjson.dumps({"status": "failed", "error": error, **importer.report()}) + b"\n"
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+
+from backend.api.dependency import require_role
+from backend.enums.role import Role
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.event_samples.repository import EventSampleRepository
+from backend.services.sqlstore.models.issues.repository import IssueRepository
+
+router = APIRouter()
+
+
+@router.get("/")
+async def get_issues(limit: int = Query(100, ge=1, le=1000),
+                     user=Depends(require_role(Role.user, Role.project_manager, Role.admin))):
+    async with get_session() as db_session:
+        repo = IssueRepository(db_session)
+        if user.role == "user":
+            issues = await repo.get_issues_for_user(user.id, limit)
+        else:
+            issues = await repo.get_issues_with_project_title(limit)
+
+    return issues
+
+
+@router.get("/{fingerprint}/samples")
+async def get_issue_samples(fingerprint: str,
+                            user=Depends(require_role(Role.user, Role.project_manager, Role.admin))):
+    """
+    Events seen and dropped by spike protection per window, newest first.
+    """
+    async with get_session() as db_session:
+        repo = EventSampleRepository(db_session)
+        samples = await repo.get_issue_samples(fingerprint, user.id if user.role == "user" else None)
+
+    return samples
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from backend.services.utils.metrics import render
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    body, content_type = render()
+    return Response(content=body, media_type=content_type)
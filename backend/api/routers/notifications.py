@@ -5,6 +5,7 @@ from backend.api.dependency import require_role
 from backend.enums.role import Role
 from backend.schemas.api.notification import NotificationRequest
 from backend.schemas.db.notification import NotificationDB
+from backend.services.notifications.routing import notification_router
 from backend.services.sqlstore.database_session import get_session
 from backend.services.sqlstore.models.notifications.repository import NotificationRepository
 from backend.services.sqlstore.models.projects.repository import ProjectRepository
@@ -35,6 +36,7 @@ async def create_notification(
 
         notif_repo = NotificationRepository(session)
         notification = await notif_repo.add_one(**payload.model_dump())
+    notification_router.invalidate(payload.project_uuid)
 
     return notification
 
@@ -45,5 +47,6 @@ async def delete_notification(notification_id: int,
     async with get_session() as db_session:
         repo = NotificationRepository(db_session)
         await repo.delete_one(id=notification_id)
+    notification_router.invalidate()
     logger.info(f"Project {notification_id} was deleted by user {user.name}")
     return {"message": "Notification deleted"}
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from backend.schemas.db.project import ProjectDB
-from backend.schemas.api.project import ProjectRequest
+from backend.schemas.api.project import ProjectRateLimitRequest, ProjectRequest
 from backend.schemas.db.user import UserDB
 from backend.api.dependency import require_role
 from backend.enums.role import Role
+from backend.services.ingest.project_keys import normalize_key, project_keys
+from backend.services.ingest.rate_limit import rate_limiter
+from backend.services.notifications.routing import notification_router
 from backend.services.sqlstore.database_session import get_session
 from backend.services.sqlstore.models.projects.repository import ProjectRepository
 from backend.services.sqlstore.models.user_projects.repository import UserProjectRepository
@@ -34,10 +37,28 @@ async def add_project(payload: ProjectRequest,
         payload = payload.model_dump()
         payload["uuid"] = get_uuid()
         project = await repo.add_one(**payload)
+    project_keys.add(payload["uuid"], payload["rate_limit"], payload["rate_burst"])
     logger.info(f"Project with uuid {project} was added to DB with user {user.name}")
     return {"message": "ok"}
 
 
+@router.put("/{project_uuid}/rate_limit")
+async def set_project_rate_limit(
+        project_uuid: str,
+        payload: ProjectRateLimitRequest,
+        user: UserDB = Depends(require_role(Role.project_manager, Role.admin))
+):
+    async with get_session() as db_session:
+        repo = ProjectRepository(db_session)
+        updated = await repo.update_one({"uuid": project_uuid}, payload.model_dump())
+    if not updated:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    project_keys.add(project_uuid, payload.rate_limit, payload.rate_burst)
+    logger.info(f"Rate limit of project {project_uuid} was set to {payload.rate_limit}/s "
+                f"with burst {payload.rate_burst} by user {user.name}")
+    return {"message": "ok"}
+
+
 @router.get("/{project_uuid}/members", response_model=List[UserDB])
 async def get_project_members(
         project_uuid: str,
@@ -110,5 +131,8 @@ async def delete_project(
     async with get_session() as db_session:
         repo = ProjectRepository(db_session)
         await repo.delete_one(uuid=project_uuid)
+    project_keys.discard(project_uuid)
+    rate_limiter.forget(normalize_key(project_uuid))
+    notification_router.invalidate(project_uuid)
     logger.info(f"Project {project_uuid} was deleted by user {user.name}")
     return {"message": "Project deleted"}
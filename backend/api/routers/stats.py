@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from backend.api.dependency import check_uuid, require_role
+from backend.enums.role import Role
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.stats.repository import StatsRepository
+
+router = APIRouter()
+
+MAX_RANGE = {
+    "minute": timedelta(days=2),
+    "hour": timedelta(days=90),
+    "day": timedelta(days=730),
+}
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    """
+    Return an aware UTC datetime; a value without an offset is taken to be UTC.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@router.get("/events")
+async def get_event_stats(
+        interval: Literal["minute", "hour", "day"] = "hour",
+        since: datetime | None = None,
+        until: datetime | None = None,
+        project_uuid: str | None = None,
+        user=Depends(require_role(Role.user, Role.project_manager, Role.admin))
+):
+    until = as_utc(until) or datetime.now(timezone.utc)
+    since = as_utc(since) or until - timedelta(days=1)
+    if since >= until or until - since > MAX_RANGE[interval]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bad_request")
+
+    async with get_session() as db_session:
+        repo = StatsRepository(db_session)
+        return await repo.get_event_counts(
+            interval,
+            since,
+            until,
+            user_id=user.id if user.role == "user" else None,
+            project_uuid=check_uuid(project_uuid),
+        )
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status
 
 from backend.schemas.api.user import UserRequest
 from backend.schemas.db.user import UserDB
-from backend.api.dependency import require_role
+from backend.api.dependency import invalidate_user, require_role
 from backend.enums.role import Role
 from backend.services.sqlstore.database_session import get_session
 from backend.services.sqlstore.models.users.repository import UserRepository
@@ -26,15 +28,19 @@ async def delete_project(
     async with get_session() as db_session:
         repo = UserRepository(db_session)
         await repo.delete_one(id=user_id)
+    invalidate_user(user_id)
     return {"message": "User deleted"}
 
 
 @router.post("/")
 async def add_user(payload: UserRequest,
                    user: UserDB = Depends(require_role(Role.project_manager, Role.admin))):
+    payload = payload.model_dump()
+    try:
+        payload["password"] = await get_password_hash(payload["password"])
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Service_unavailable")
     async with get_session() as db_session:
         repo = UserRepository(db_session)
-        payload = payload.model_dump()
-        payload["password"] = get_password_hash(payload["password"])
         await repo.add_one(**payload)
     return {"message": "ok"}
@@ -0,0 +1,78 @@
+"""
+Check that a decompression bomb is rejected without inflating it into memory.
+
+For every supported content-encoding a small body that expands to `--expanded` bytes
+is pushed through `iter_decompressed` with the default envelope limit. The run fails if
+the body is not rejected with EnvelopeTooLarge, or if the peak traced allocation while
+decoding exceeds `--max-peak` bytes.
+
+Usage:
+    python -m backend.benchmarks.decompression_bombs --expanded 419430400
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+import tracemalloc
+import zlib
+
+from backend.services.utils.config import Config
+from backend.services.utils.envelope import EnvelopeTooLarge, brotli, iter_decompressed, zstandard
+
+
+def make_bombs(expanded: int) -> dict[str, bytes]:
+    data = b"\0" * expanded
+    bombs = {
+        "gzip": gzip.compress(data, compresslevel=9),
+        "deflate": zlib.compress(data, 9),
+    }
+    if brotli is not None:
+        bombs["br"] = brotli.compress(data)
+    if zstandard is not None:
+        bombs["zstd"] = zstandard.ZstdCompressor(level=19).compress(data)
+    return bombs
+
+
+async def body(data: bytes, chunk_size: int):
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+async def measure(encoding: str, data: bytes, max_size: int, chunk_size: int) -> dict:
+    rejected = False
+    tracemalloc.start()
+    try:
+        async for _ in iter_decompressed(body(data, chunk_size), encoding, max_size):
+            pass
+    except EnvelopeTooLarge:
+        rejected = True
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"compressed": len(data), "rejected": rejected, "peak_bytes": peak}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--expanded", type=int, default=400 * 1024 * 1024)
+    parser.add_argument("--max-size", type=int, default=Config.ENVELOPE_MAX_SIZE)
+    parser.add_argument("--max-peak", type=int, default=8 * 1024 * 1024)
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024, help="size of the request body chunks")
+    args = parser.parse_args()
+
+    results = {}
+    for encoding, data in make_bombs(args.expanded).items():
+        results[encoding] = asyncio.run(measure(encoding, data, args.max_size, args.chunk_size))
+    print(json.dumps(results, indent=2))
+
+    failed = [
+        encoding for encoding, result in results.items()
+        if not result["rejected"] or result["peak_bytes"] > args.max_peak
+    ]
+    if failed:
+        print(f"bomb not contained for: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
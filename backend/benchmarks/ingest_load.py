@@ -0,0 +1,375 @@
+"""
+End-to-end load test of the envelope ingest path.
+
+Generates gzip-compressed Sentry envelopes, posts them concurrently to a running
+backend's `/api/{project_id}/envelope/` endpoint and reports request throughput,
+latency percentiles, the rate at which events reach the database (stored in `events`
+or counted as dropped in `event_samples` by spike protection), webhook
+deliveries received by a local stub server, and error rates.
+
+The backend must point at the same database as this script (the usual DB_* settings).
+Load-test projects titled "ingest-load-<n>" are created on first use, each with one
+notification aimed at the stub server; run once with `--setup-only` and wait for
+PROJECT_KEYS_REFRESH_INTERVAL so every backend worker knows the new keys. When the
+backend runs in docker, the stub has to listen on an address the container can reach
+and be announced under a name it resolves (`--webhook-bind 0.0.0.0 --webhook-host
+host.docker.internal`); the notification URL is rewritten on every run.
+
+Usage:
+    python -m backend.benchmarks.ingest_load --setup-only --projects 10
+    python -m backend.benchmarks.ingest_load --requests 20000 --concurrency 64 --save-baseline main
+    python -m backend.benchmarks.ingest_load --requests 20000 --concurrency 64 --compare main
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+from sqlalchemy import text
+
+from backend.services.sqlstore.database_session import dispose_engine, get_session
+from backend.services.utils.uuid_creator import get_uuid
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+PROJECT_PREFIX = "ingest-load-"
+NOTIFICATION_TITLE = "ingest-load"
+
+# Metrics where a larger value is better; for the rest (latencies, error rate) smaller is better.
+HIGHER_IS_BETTER = {"requests_per_s", "events_per_s", "db_rows_per_s", "webhooks_received"}
+
+EXCEPTION_TYPES = ["ValueError", "KeyError", "ZeroDivisionError", "TimeoutError", "RuntimeError", "TypeError"]
+MODULES = ["app.api.orders", "app.services.billing", "app.db.session", "app.workers.sync", "app.utils.cache"]
+
+
+class EnvelopeGenerator:
+    """
+    Builds realistic gzip-compressed envelopes with one error event each.
+
+    With probability `duplicate_ratio` an event repeats one of a few recurring error
+    signatures, so it lands on an existing issue; otherwise it gets a unique one.
+    """
+
+    def __init__(self, frame_depth: int, context_lines: int, duplicate_ratio: float, seed: int):
+        self.frame_depth = frame_depth
+        self.context_lines = context_lines
+        self.duplicate_ratio = duplicate_ratio
+        self._random = random.Random(seed)
+        self._recurring = [self._signature() for _ in range(20)]
+
+    def _signature(self) -> dict:
+        exception_type = self._random.choice(EXCEPTION_TYPES)
+        frames = [self._frame(depth) for depth in range(self.frame_depth)]
+        return {"type": exception_type, "value": f"{exception_type} in {frames[-1]['function']}", "frames": frames}
+
+    def _frame(self, depth: int) -> dict:
+        module = self._random.choice(MODULES)
+        function = f"handler_{depth}_{self._random.randrange(10 ** 6)}"
+        lineno = self._random.randrange(10, 2000)
+        source = [f"    result = step_{depth}_{line}(payload, retries={line})" for line in range(self.context_lines)]
+        return {
+            "filename": module.replace(".", "/") + ".py",
+            "abs_path": "/srv/" + module.replace(".", "/") + ".py",
+            "function": function,
+            "module": module,
+            "lineno": lineno,
+            "pre_context": source,
+            "context_line": f"    raise_for_{function}()",
+            "post_context": source,
+            "in_app": True,
+        }
+
+    def build(self, public_key: str) -> bytes:
+        if self._random.random() < self.duplicate_ratio:
+            signature = self._random.choice(self._recurring)
+        else:
+            signature = self._signature()
+        event_id = get_uuid()
+        payload = {
+            "event_id": event_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "platform": "python",
+            "level": "error",
+            "server_name": f"load-{self._random.randrange(8)}",
+            "contexts": {"runtime": {"name": "CPython", "version": "3.12.3", "build": "main"}},
+            "exception": {"values": [{
+                "type": signature["type"],
+                "value": signature["value"],
+                "mechanism": {"type": "generic", "handled": False},
+                "stacktrace": {"frames": signature["frames"]},
+            }]},
+        }
+        body = json.dumps(payload).encode()
+        envelope = b"\n".join([
+            json.dumps({"event_id": event_id, "sent_at": payload["timestamp"],
+                        "trace": {"public_key": public_key}}).encode(),
+            json.dumps({"type": "event", "content_type": "application/json", "length": len(body)}).encode(),
+            body,
+        ]) + b"\n"
+        return gzip.compress(envelope)
+
+
+class WebhookStub:
+    """
+    Local HTTP server standing in for Mattermost; counts what the outbox delivers.
+    """
+
+    def __init__(self, bind: str, port: int, host: str):
+        self.bind = bind
+        self.port = port
+        # The name the backend uses to reach the stub, e.g. host.docker.internal from a container.
+        self.host = host
+        self.received = 0
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/hooks/load"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        await request.read()
+        self.received += 1
+        return web.Response(text="ok")
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/hooks/load", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.bind, self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+async def setup_projects(count: int, webhook_url: str) -> list[str]:
+    """
+    Return the keys of `count` load-test projects, creating the missing ones, and
+    point their notification at the stub server.
+
+    Existing notifications are updated in place rather than recreated: a running
+    server caches routes by notification id, and a new id would only be seen after
+    the cache expires.
+    """
+    async with get_session() as db_session:
+        result = await db_session.execute(
+            text("SELECT uuid FROM projects WHERE title LIKE :prefix ORDER BY title"),
+            {"prefix": PROJECT_PREFIX + "%"},
+        )
+        keys = [str(key).replace("-", "") for key in result.scalars().all()]
+        for index in range(len(keys), count):
+            key = get_uuid()
+            await db_session.execute(
+                text("INSERT INTO projects (uuid, title, description) VALUES (:uuid, :title, 'Load test')"),
+                {"uuid": key, "title": f"{PROJECT_PREFIX}{index:04d}"},
+            )
+            keys.append(key)
+        keys = keys[:count]
+
+        await db_session.execute(
+            text("UPDATE notifications SET url = :url "
+                 "WHERE title = :title AND project_uuid = ANY(CAST(:keys AS uuid[]))"),
+            {"title": NOTIFICATION_TITLE, "url": webhook_url, "keys": keys},
+        )
+        for key in keys:
+            await db_session.execute(
+                text("INSERT INTO notifications (title, type, url, project_uuid, created_at) "
+                     "SELECT :title, 'mattermost', :url, CAST(:project_uuid AS uuid), now() "
+                     "WHERE NOT EXISTS (SELECT 1 FROM notifications "
+                     "WHERE title = :title AND project_uuid = CAST(:project_uuid AS uuid))"),
+                {"title": NOTIFICATION_TITLE, "url": webhook_url, "project_uuid": key},
+            )
+        await db_session.commit()
+    return keys
+
+
+async def count_rows(keys: list[str]) -> tuple[int, int]:
+    """
+    Return how many events of the load-test projects were stored, and how many
+    spike protection counted in event_samples instead of storing them.
+    """
+    async with get_session() as db_session:
+        result = await db_session.execute(
+            text(
+                "SELECT (SELECT count(*) FROM events WHERE project_uuid = ANY(CAST(:keys AS uuid[]))), "
+                "(SELECT coalesce(sum(dropped), 0) FROM event_samples "
+                "WHERE project_uuid = ANY(CAST(:keys AS uuid[])))"
+            ),
+            {"keys": keys},
+        )
+        stored, dropped = result.one()
+        return stored, int(dropped)
+
+
+async def drive(args: argparse.Namespace, keys: list[str], generator: EnvelopeGenerator) -> dict:
+    # Built up front so that compressing envelopes does not compete with sending them.
+    pool = []
+    for _ in range(args.pool):
+        key = random.choice(keys)
+        pool.append((key, generator.build(key)))
+
+    url = f"{args.url.rstrip('/')}/api/0/envelope/"
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    next_request = 0
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        nonlocal next_request
+        while next_request < args.requests:
+            key, body = pool[next_request % len(pool)]
+            next_request += 1
+            headers = {
+                "Content-Type": "application/x-sentry-envelope",
+                "Content-Encoding": "gzip",
+                "X-Sentry-Auth": f"Sentry sentry_version=7, sentry_key={key}",
+            }
+            started = time.perf_counter()
+            try:
+                async with session.post(url, data=body, headers=headers) as response:
+                    await response.read()
+                    statuses[str(response.status)] += 1
+            except aiohttp.ClientError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(worker(session) for _ in range(args.concurrency)))
+    return {"elapsed": time.perf_counter() - started, "latencies": latencies, "statuses": statuses}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args: argparse.Namespace) -> dict | None:
+    stub = WebhookStub(args.webhook_bind, args.webhook_port, args.webhook_host)
+    keys = await setup_projects(args.projects, stub.url)
+    if args.setup_only:
+        print(f"{len(keys)} load-test projects ready, wait for the backend to reload project keys")
+        return None
+
+    await stub.start()
+    try:
+        stored_before, dropped_before = await count_rows(keys)
+        started = time.perf_counter()
+        generator = EnvelopeGenerator(args.frame_depth, args.context_lines, args.duplicate_ratio, args.seed)
+        result = await drive(args, keys, generator)
+
+        accepted = result["statuses"].get("202", 0)
+        # The ingest buffer writes behind, wait until the accepted events have landed:
+        # either stored or, with the recurring signatures, dropped by spike protection.
+        deadline = time.perf_counter() + args.drain_timeout
+        while True:
+            stored, dropped = await count_rows(keys)
+            rows, dropped = stored - stored_before, dropped - dropped_before
+            if rows + dropped >= accepted or time.perf_counter() >= deadline:
+                break
+            await asyncio.sleep(0.25)
+        db_elapsed = time.perf_counter() - started
+
+        await asyncio.sleep(args.webhook_wait)
+    finally:
+        await stub.stop()
+        await dispose_engine()
+
+    latencies = result["latencies"]
+    requests = len(latencies)
+    return {
+        "config": {name: getattr(args, name) for name in (
+            "requests", "concurrency", "projects", "frame_depth", "context_lines", "duplicate_ratio", "pool",
+        )},
+        "metrics": {
+            "requests_per_s": round(requests / result["elapsed"], 1),
+            "events_per_s": round(accepted / result["elapsed"], 1),
+            "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "latency_p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "latency_mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+            "db_rows_per_s": round((rows + dropped) / db_elapsed, 1),
+            "error_rate": round((requests - accepted) / requests, 4),
+            "webhooks_received": stub.received,
+        },
+        "statuses": dict(result["statuses"]),
+        "db_rows": rows,
+        "db_dropped": dropped,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> bool:
+    """
+    Print every metric next to the baseline and return False if any of them got
+    worse by more than `tolerance` (a fraction).
+    """
+    ok = True
+    for name, value in report["metrics"].items():
+        old = baseline["metrics"].get(name)
+        if old in (None, 0):
+            print(f"{name:>20}: {value}")
+            continue
+        change = (value - old) / old
+        worse = -change if name in HIGHER_IS_BETTER else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        ok = ok and not flag
+        print(f"{name:>20}: {value:>10} (baseline {old}, {change:+.1%}) {flag}")
+    if report["config"] != baseline["config"]:
+        print(f"warning: baseline was recorded with {baseline['config']}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="backend base URL")
+    parser.add_argument("--requests", type=int, default=10000, help="envelopes to send")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--projects", type=int, default=10, help="load-test projects to spread events over")
+    parser.add_argument("--frame-depth", type=int, default=15, help="stack frames per event")
+    parser.add_argument("--context-lines", type=int, default=5, help="source lines before and after each frame")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.9,
+                        help="share of events that repeat a recurring error signature")
+    parser.add_argument("--pool", type=int, default=2000, help="distinct envelopes generated before the run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--webhook-bind", default="127.0.0.1", help="address the webhook stub listens on")
+    parser.add_argument("--webhook-host", default="127.0.0.1",
+                        help="host the backend reaches the stub at, host.docker.internal when it runs in docker")
+    parser.add_argument("--webhook-port", type=int, default=8099)
+    parser.add_argument("--webhook-wait", type=float, default=5, help="seconds to keep the stub up after the run")
+    parser.add_argument("--drain-timeout", type=float, default=60,
+                        help="seconds to wait for accepted events to reach the database")
+    parser.add_argument("--setup-only", action="store_true", help="only create the load-test projects")
+    parser.add_argument("--save-baseline", metavar="NAME", help="save the report as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare with baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed regression as a fraction")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if report is None:
+        return 0
+    print(json.dumps(report, indent=2))
+
+    ok = True
+    if args.compare:
+        baseline = json.loads((BASELINES_DIR / f"{args.compare}.json").read_text())
+        ok = compare(report, baseline, args.tolerance)
+    if args.save_baseline:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        (BASELINES_DIR / f"{args.save_baseline}.json").write_text(json.dumps(report, indent=2) + "\n")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Measure event-loop lag while a burst of logins verifies passwords.
+
+A ticker task sleeps for `--tick` seconds in a loop and records how late it wakes up,
+which is the delay every other coroutine on the worker (ingest requests included)
+would see. The burst is run twice: with bcrypt called inline, as the handlers used to
+do, and through the bounded hashing pool.
+
+Usage:
+    python -m backend.benchmarks.password_hashing --logins 50 --rounds 12
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+
+from backend.services.utils import hash_creator
+
+
+async def measure_lag(stop: asyncio.Event, tick: float) -> list[float]:
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(tick)
+        lags.append(time.perf_counter() - started - tick)
+    return lags
+
+
+async def inline_check(password: str, hashed: bytes) -> bool:
+    return hash_creator.check_password_sync(password, hashed)
+
+
+async def pooled_check(password: str, hashed: bytes) -> bool:
+    while True:
+        try:
+            return await hash_creator.check_password(password, hashed)
+        except asyncio.QueueFull:
+            await asyncio.sleep(0.01)
+
+
+async def run(check, logins: int, password: str, hashed: bytes, tick: float) -> dict:
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop, tick))
+    await asyncio.sleep(tick * 2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(check(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    lags = sorted(await ticker)
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(logins / elapsed, 1),
+        "lag_p50_ms": round(statistics.median(lags) * 1000, 2),
+        "lag_p99_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000, 2),
+        "lag_max_ms": round(lags[-1] * 1000, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    password = "benchmark-password"
+    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=args.rounds))
+    for name, check in (("inline", inline_check), ("pooled", pooled_check)):
+        print(name, await run(check, args.logins, password, hashed, args.tick))
+    hash_creator.shutdown_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50, help="concurrent password checks")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt work factor of the stored hash")
+    parser.add_argument("--tick", type=float, default=0.005, help="ticker interval in seconds")
+    asyncio.run(main(parser.parse_args()))
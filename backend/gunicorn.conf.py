@@ -0,0 +1,22 @@
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+bind = "0.0.0.0:80"
+workers = 4
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def on_starting(server):
+    # Samples left by a previous run would be summed into the new totals.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+
+def child_exit(server, worker):
+    # Drops the live gauges of a dead worker; its counters keep counting towards the totals.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
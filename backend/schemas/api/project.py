@@ -1,6 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ProjectRequest(BaseModel):
     title: str
     description: str
+    rate_limit: float | None = Field(None, ge=0)
+    rate_burst: int | None = Field(None, ge=1)
+
+
+class ProjectRateLimitRequest(BaseModel):
+    rate_limit: float | None = Field(None, ge=0)
+    rate_burst: int | None = Field(None, ge=1)
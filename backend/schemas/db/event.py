@@ -4,22 +4,22 @@ from pydantic import BaseModel
 
 
 class EventDB(BaseModel):
-    # TODO тот случай, если поля нет в евенте
     uuid: str
     project_uuid: str
-    type: str
-    value: str
+    fingerprint: str
+    type: str | None = None
+    value: str | None = None
     level: str
-    lineno: int
-    context: str
-    start_line: int
-    function: str
-    abs_path: str
-    filename: str
-    runtime_version: str
-    runtime_name: str
-    runtime_build: str
-    module: str
-    platform: str
-    server_name: str
+    lineno: int | None = None
+    context: str | None = None
+    start_line: int | None = None
+    function: str | None = None
+    abs_path: str | None = None
+    filename: str | None = None
+    runtime_version: str | None = None
+    runtime_name: str | None = None
+    runtime_build: str | None = None
+    module: str | None = None
+    platform: str | None = None
+    server_name: str | None = None
     timestamp: datetime
@@ -5,3 +5,5 @@ class ProjectDB(BaseModel):
     uuid: str
     title: str
     description: str
+    rate_limit: float | None = None
+    rate_burst: int | None = None
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections import deque
+
+from backend.schemas.db.event import EventDB
+from backend.services.notifications.coalescing import notification_coalescer
+from backend.services.notifications.outbox import build_outbox_rows
+from backend.services.sqlstore import timescale
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.event_samples.repository import EventSampleRepository
+from backend.services.sqlstore.models.events.repository import EventRepository
+from backend.services.sqlstore.models.issues.repository import IssueRepository
+from backend.services.sqlstore.models.notification_outbox.repository import NotificationOutboxRepository
+from backend.services.sqlstore.models.stats.model import dropped_stats_tables
+from backend.services.sqlstore.models.stats.repository import StatsRepository
+from backend.services.utils.config import Config
+from backend.services.utils.logger import Logger
+from backend.services.utils.metrics import DB_FLUSH_SECONDS, DB_ROWS
+
+logger = Logger(__name__)
+
+
+class IngestBuffer:
+    """
+    Write-behind buffer for parsed events.
+
+    Producers enqueue `EventDB` records without waiting for the database. A single
+    background task flushes them in multi-row batches as soon as `batch_size` records
+    are pending or the oldest pending record has waited `max_latency` seconds.
+    """
+
+    def __init__(self, batch_size: int, max_latency: float, max_pending: int):
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.max_pending = max_pending
+
+        # (enqueued at on the loop clock, event), so the deadline always follows the oldest event.
+        self._pending: deque[tuple[float, EventDB]] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+        self.flushed = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.depth,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop accepting work and wait until every pending event has been flushed.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    def put(self, *events: EventDB) -> None:
+        """
+        Enqueue events for the next flush.
+
+        Raises:
+            asyncio.QueueFull: If the buffer is stopped or has no room for all the events.
+        """
+        if self._task is None or self._stopping:
+            raise asyncio.QueueFull("Ingest buffer is not running")
+        if len(self._pending) + len(events) > self.max_pending:
+            raise asyncio.QueueFull("Ingest buffer is full")
+        was_empty = not self._pending
+        enqueued_at = asyncio.get_running_loop().time()
+        self._pending.extend((enqueued_at, event) for event in events)
+        # An empty buffer means the flusher is idle and has to start the latency clock.
+        if was_empty or len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                if self._stopping:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            deadline = self._pending[0][0] + self.max_latency
+            while len(self._pending) < self.batch_size and not self._stopping:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [self._pending.popleft()[1] for _ in range(min(self.batch_size, len(self._pending)))]
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[EventDB]) -> None:
+        started = time.perf_counter()
+        try:
+            await self._write(batch)
+        except Exception as e:
+            logger.error(f"Batch insert of {len(batch)} events failed, retrying row by row: {e}")
+            for event in batch:
+                try:
+                    await self._write([event])
+                except Exception as row_error:
+                    self.failed += 1
+                    DB_ROWS.labels("failed").inc()
+                    logger.error(f"Event with uuid {event.uuid} was dropped: {row_error}")
+                else:
+                    self.flushed += 1
+                    DB_ROWS.labels("written").inc()
+        else:
+            self.flushed += len(batch)
+            DB_ROWS.labels("written").inc(len(batch))
+            DB_FLUSH_SECONDS.observe(time.perf_counter() - started)
+        self.batches += 1
+
+    @staticmethod
+    async def _write(events: list[EventDB]) -> None:
+        staged = {}
+        async with get_session() as db_session:
+            # Issue counters and rollups count every event, including the ones spike protection drops.
+            await IssueRepository(db_session).upsert_many(events, commit=False)
+            stats = StatsRepository(db_session)
+            if not timescale.is_enabled():
+                await stats.increment(events, commit=False)
+            kept = await EventSampleRepository(db_session).sample(
+                events, Config.SPIKE_PROTECTION_LIMIT, Config.SPIKE_PROTECTION_WINDOW, commit=False
+            )
+            if timescale.is_enabled() and len(kept) < len(events):
+                # The continuous aggregates only see stored events.
+                kept_ids = {id(event) for event in kept}
+                dropped = [event for event in events if id(event) not in kept_ids]
+                await stats.increment(dropped, commit=False, tables=dropped_stats_tables)
+            events = kept
+            # Notifications are committed together with their events, never without them.
+            outbox_rows = await build_outbox_rows(events, staged)
+            await NotificationOutboxRepository(db_session).enqueue(outbox_rows, commit=False)
+            await EventRepository(db_session).add_many([event.model_dump() for event in events])
+        notification_coalescer.apply(staged)
+
+
+ingest_buffer = IngestBuffer(
+    batch_size=Config.INGEST_BATCH_SIZE,
+    max_latency=Config.INGEST_MAX_LATENCY,
+    max_pending=Config.INGEST_MAX_PENDING,
+)
@@ -0,0 +1,189 @@
+import asyncio
+from typing import AsyncIterator
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from backend.schemas.db.event import EventDB
+from backend.services.ingest.project_keys import normalize_key
+from backend.services.sqlstore import timescale
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.events.repository import EventRepository
+from backend.services.sqlstore.models.issues.repository import IssueRepository
+from backend.services.sqlstore.models.stats.repository import StatsRepository
+from backend.services.utils.envelope import EnvelopeReader, LineTooLong
+from backend.services.utils.fingerprint import get_fingerprint
+from backend.services.utils.logger import Logger
+from backend.services.utils.sentry import EVENT_ITEM_TYPES, Sentry
+from backend.services.utils.uuid_creator import get_uuid
+
+logger = Logger(__name__)
+
+
+class EventImporter:
+    """
+    Bulk import of NDJSON into one project.
+
+    Every line is either an event in the export format (`kind="events"`) or a whole
+    Sentry envelope shaped like api/example.json (`kind="envelopes"`). Lines are
+    validated one by one; invalid ones and lines over `max_line_size` bytes are
+    reported and skipped. Valid events are written `batch_size` at a time, each batch
+    in its own transaction, while the next batch is being parsed. Notifications and
+    spike protection do not apply to imports.
+    """
+
+    def __init__(self, project_uuid: str, kind: str, batch_size: int, max_errors: int, max_line_size: int):
+        self.project_uuid = normalize_key(project_uuid)
+        self.kind = kind
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.max_line_size = max_line_size
+
+        self.lines = 0
+        self.imported = 0
+        self.errors = 0
+        self.error_samples: list[dict] = []
+        # Messages for the client, collected while parsing and writing and handed out by `stream`.
+        self._messages: list[dict] = []
+
+    def report(self) -> dict:
+        return {
+            "lines": self.lines,
+            "imported": self.imported,
+            "errors": self.errors,
+            "error_samples": self.error_samples,
+        }
+
+    async def stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+        """
+        Import the upload and yield progress while it runs: `{"line", "error"}` for each
+        of the first `max_errors` bad lines, `{"progress": report}` after every written
+        batch and finally `{"status": "imported", **report}`.
+        """
+        reader = EnvelopeReader(chunks)
+        batch: list[EventDB] = []
+        writing: asyncio.Task | None = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline(self.max_line_size)
+                except LineTooLong as e:
+                    self.lines += 1
+                    self._error(self.lines, e)
+                    continue
+                if line is None:
+                    break
+                self.lines += 1
+                if line.strip():
+                    try:
+                        batch.extend(self.parse_line(line))
+                    except (ValueError, TypeError, KeyError, ValidationError) as e:
+                        self._error(self.lines, e)
+                if len(batch) >= self.batch_size:
+                    if writing is not None:
+                        await writing
+                    writing = asyncio.create_task(self._write(batch))
+                    batch = []
+                for message in self._drain():
+                    yield message
+            if writing is not None:
+                await writing
+                writing = None
+            await self._write(batch)
+        finally:
+            if writing is not None:
+                writing.cancel()
+        for message in self._drain():
+            yield message
+        yield {"status": "imported", **self.report()}
+
+    def _drain(self) -> list[dict]:
+        messages, self._messages = self._messages, []
+        return messages
+
+    def parse_line(self, line: bytes) -> list[EventDB]:
+        data = orjson.loads(line)
+        if not isinstance(data, dict):
+            raise ValueError("expected an object")
+        if self.kind == "envelopes":
+            return self._parse_envelope(data)
+        return [self._parse_event(data)]
+
+    def _parse_event(self, data: dict) -> EventDB:
+        # Fingerprints include the project, so events moved from another project are regrouped.
+        # The export only keeps the innermost frame, so that is all the new fingerprint can use.
+        if not data.get("fingerprint") or normalize_key(data.get("project_uuid")) != self.project_uuid:
+            frame = {"module": data.get("module"), "function": data.get("function")}
+            data["fingerprint"] = get_fingerprint(self.project_uuid, data.get("type"), data.get("value"), [frame])
+        data["project_uuid"] = self.project_uuid
+        data.setdefault("uuid", get_uuid())
+        data.setdefault("level", "unmarked")
+        return EventDB(**data)
+
+    def _parse_envelope(self, data: dict) -> list[EventDB]:
+        envelope_headers = data.get("envelope_headers") or {}
+        events = []
+        for item in data.get("items") or []:
+            if (item.get("item_header") or {}).get("type") not in EVENT_ITEM_TYPES:
+                continue
+            event = Sentry.event_from_payload(envelope_headers, item.get("payload") or {}, self.project_uuid)
+            if event is None:
+                raise ValueError("invalid event payload")
+            events.append(event)
+        return events
+
+    def _error(self, line: int, error: Exception) -> None:
+        self.errors += 1
+        if len(self.error_samples) < self.max_errors:
+            sample = {"line": line, "error": str(error)[:500]}
+            self.error_samples.append(sample)
+            self._messages.append(sample)
+
+    async def _write(self, events: list[EventDB]) -> None:
+        if not events:
+            return
+        try:
+            # Plain batches go through COPY.
+            self.imported += await self._write_batch(events)
+        except IntegrityError:
+            # Some events were already imported; skip those instead of failing the batch.
+            self.imported += await self._write_new(events)
+        self._messages.append({"progress": {"lines": self.lines, "imported": self.imported, "errors": self.errors}})
+        logger.info(f"Import into project {self.project_uuid}: {self.lines} lines read, "
+                    f"{self.imported} events written, {self.errors} errors")
+
+    @staticmethod
+    async def _write_batch(events: list[EventDB]) -> int:
+        async with get_session() as db_session:
+            await IssueRepository(db_session).upsert_many(events, commit=False)
+            if not timescale.is_enabled():
+                await StatsRepository(db_session).increment(events, commit=False)
+            await EventRepository(db_session).add_many([event.model_dump() for event in events])
+        return len(events)
+
+    @staticmethod
+    async def _write_new(events: list[EventDB]) -> int:
+        """
+        Insert the events that are not stored yet and count only those in issues and rollups,
+        so importing the same file twice changes nothing.
+        """
+        async with get_session() as db_session:
+            issues = IssueRepository(db_session)
+            # Events reference their issue, so it has to exist before the insert tells which are new.
+            await issues.add_missing(events, commit=False)
+            keys = await EventRepository(db_session).add_many(
+                [event.model_dump() for event in events], on_conflict="ignore", returning=True, commit=False
+            )
+            inserted = {normalize_key(str(uuid)) for uuid, _ in keys}
+            new_events = []
+            for event in events:
+                key = normalize_key(event.uuid)
+                if key in inserted:
+                    inserted.discard(key)
+                    new_events.append(event)
+            await issues.upsert_many(new_events, commit=False)
+            if not timescale.is_enabled():
+                await StatsRepository(db_session).increment(new_events, commit=False)
+            await db_session.commit()
+        return len(new_events)
@@ -0,0 +1,113 @@
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import select
+
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.projects.model import Project
+from backend.services.utils.config import Config
+from backend.services.utils.logger import Logger
+
+logger = Logger(__name__)
+
+
+def normalize_key(key: str | None) -> str | None:
+    """
+    Return the project key as 32 lowercase hex digits, or None if it is not a UUID.
+    DSNs carry the key without dashes while the database returns it with them.
+    """
+    if not key:
+        return None
+    try:
+        return uuid.UUID(key).hex
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+class ProjectKeyRegistry:
+    """
+    Per-worker map of valid project keys to their ingest rate limits, used to reject
+    envelopes for unknown projects before their body is read.
+
+    The set is loaded at startup, updated in place by the projects router of this
+    worker and reloaded every `refresh_interval` seconds to pick up projects added
+    or deleted through other workers.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+
+        self._keys: dict[str, tuple[float | None, int | None]] = {}
+        self._loaded_at: float | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+
+        self.rejected = 0
+
+    def stats(self) -> dict:
+        return {
+            "projects": len(self._keys),
+            "rejected": self.rejected,
+            "loaded_ago": None if self._loaded_at is None else round(time.monotonic() - self._loaded_at, 1),
+        }
+
+    def is_known(self, key: str | None) -> bool:
+        known = normalize_key(key) in self._keys
+        if not known:
+            self.rejected += 1
+        return known
+
+    def get_limits(self, key: str | None) -> tuple[float | None, int | None]:
+        """
+        Return the project's (rate, burst) overrides; None means the configured default.
+        """
+        return self._keys.get(normalize_key(key), (None, None))
+
+    def add(self, key: str, rate_limit: float | None = None, rate_burst: int | None = None) -> None:
+        key = normalize_key(key)
+        if key:
+            self._keys = {**self._keys, key: (rate_limit, rate_burst)}
+
+    def discard(self, key: str) -> None:
+        key = normalize_key(key)
+        self._keys = {k: limits for k, limits in self._keys.items() if k != key}
+
+    async def load(self) -> None:
+        async with get_session() as db_session:
+            result = await db_session.execute(select(Project.uuid, Project.rate_limit, Project.rate_burst))
+            keys = {
+                normalize_key(str(key)): (rate_limit, rate_burst)
+                for key, rate_limit, rate_burst in result.all()
+            }
+        self._keys = keys
+        self._loaded_at = time.monotonic()
+
+    async def start(self) -> None:
+        await self.load()
+        logger.info(f"Loaded {len(self._keys)} project keys")
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                return
+            try:
+                await self.load()
+            except Exception as e:
+                logger.error(f"Cannot refresh project keys: {e}")
+
+
+project_keys = ProjectKeyRegistry(refresh_interval=Config.PROJECT_KEYS_REFRESH_INTERVAL)
@@ -0,0 +1,99 @@
+import time
+
+from backend.services.utils.config import Config
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self) -> float:
+        """
+        Take one token. Return 0 on success, otherwise the seconds until one is available.
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def charge(self, cost: float) -> None:
+        """
+        Take tokens for work that was already admitted; the bucket may go into debt.
+        """
+        self._refill()
+        self.tokens -= cost
+
+
+class ProjectRateLimiter:
+    """
+    Per-worker token buckets for envelope ingestion, one per project.
+
+    An envelope needs one token to be admitted, and once parsed it is charged for its
+    remaining events, so the limit holds in events per second. `rate` and `burst`
+    come from the project and fall back to the defaults; a rate of 0 disables the limit.
+    Each gunicorn worker has its own buckets, so the effective limit scales with workers.
+    """
+
+    def __init__(self, default_rate: float, default_burst: int):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def stats(self) -> dict:
+        return {key: dict(counters) for key, counters in self._counters.items()}
+
+    def _bucket(self, key: str, rate: float | None, burst: int | None) -> TokenBucket | None:
+        rate = self.default_rate if rate is None else rate
+        burst = self.default_burst if burst is None else burst
+        if rate <= 0:
+            self._buckets.pop(key, None)
+            return None
+        burst = max(burst, 1)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+        elif bucket.rate != rate or bucket.burst != burst:
+            bucket.rate, bucket.burst = rate, burst
+        return bucket
+
+    def _count(self, key: str, name: str, value: int = 1) -> None:
+        counters = self._counters.setdefault(key, {"accepted": 0, "rejected": 0})
+        counters[name] += value
+
+    def acquire(self, key: str, rate: float | None = None, burst: int | None = None) -> float:
+        """
+        Admit one envelope for the project. Return 0 if it may proceed, otherwise
+        the seconds the client should wait before retrying.
+        """
+        bucket = self._bucket(key, rate, burst)
+        retry_after = bucket.acquire() if bucket is not None else 0
+        self._count(key, "rejected" if retry_after else "accepted")
+        return retry_after
+
+    def charge(self, key: str, cost: int) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is not None and cost > 0:
+            bucket.charge(cost)
+
+    def forget(self, key: str) -> None:
+        self._buckets.pop(key, None)
+        self._counters.pop(key, None)
+
+
+rate_limiter = ProjectRateLimiter(
+    default_rate=Config.INGEST_RATE_LIMIT,
+    default_burst=Config.INGEST_RATE_BURST,
+)
@@ -1,24 +1,56 @@
+from datetime import datetime
+
 import aiohttp
 
 
 class WebhookSender:
+    notification_type = "webhook"
+
     def __init__(self, url: str, headers: dict = None, method: str = "POST"):
         self.url = url
         self.headers = headers or {"Content-Type": "application/json"}
         self.method = method.upper()
 
-    async def send(self, payload: dict, timeout: int = 5) -> aiohttp.ClientResponse:
-        async with aiohttp.ClientSession() as db_session:
-            try:
-                async with db_session.request(
-                        method=self.method,
-                        url=self.url,
-                        json=payload,
-                        headers=self.headers,
-                        timeout=timeout
-                ) as response:
-                    response.raise_for_status()
-                    return response
-            except aiohttp.ClientError as e:
-                print(f"Error sending webhook: {e}")
-                raise
+    def format_event(self, event_data: dict) -> dict:
+        """
+        Build the request body for an event. Generic webhooks get the event fields as JSON.
+        """
+        return {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in event_data.items()
+        }
+
+    def format_digest(self, digest_data: dict) -> dict:
+        """
+        Build the request body for a digest of suppressed repeats of one error.
+        """
+        return {"digest": True, **self.format_event(digest_data)}
+
+    async def send(self, payload: dict, timeout: int = 5,
+                   session: aiohttp.ClientSession | None = None) -> aiohttp.ClientResponse:
+        """
+        Send a payload to the webhook.
+
+        Parameters:
+            payload (dict): JSON body.
+            timeout (int): Total request timeout in seconds.
+            session (aiohttp.ClientSession | None): Shared client to reuse pooled connections;
+                a throwaway one is created when omitted.
+        """
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                return await self.send(payload, timeout, own_session)
+
+        try:
+            async with session.request(
+                    method=self.method,
+                    url=self.url,
+                    json=payload,
+                    headers=self.headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                response.raise_for_status()
+                return response
+        except aiohttp.ClientError as e:
+            print(f"Error sending webhook: {e}")
+            raise
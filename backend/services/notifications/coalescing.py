@@ -0,0 +1,198 @@
+import asyncio
+import time
+
+from backend.schemas.db.event import EventDB
+from backend.services.notifications.routing import SENDERS, Route
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.notification_outbox.repository import NotificationOutboxRepository
+from backend.services.utils.config import Config
+from backend.services.utils.logger import Logger
+
+logger = Logger(__name__)
+
+
+class _Window:
+    __slots__ = ("route", "ends_at", "suppressed", "event")
+
+    def __init__(self, route: Route, ends_at: float, event: EventDB):
+        self.route = route
+        self.ends_at = ends_at
+        self.suppressed = 0
+        self.event = event
+
+
+class _Pending:
+    """
+    Changes one transaction makes to a window, applied only once it has committed.
+    """
+    __slots__ = ("route", "window", "suppressed", "event", "opened", "closed")
+
+    def __init__(self, route: Route, window: _Window | None):
+        self.route = route
+        self.window = window
+        self.suppressed = 0
+        self.event = None
+        self.opened: _Window | None = None
+        self.closed: list[_Window] = []
+
+
+class NotificationCoalescer:
+    """
+    Throttles notifications per (notification, error signature) during error storms.
+
+    The first event of a signature opens a `window`-second window and is sent right
+    away; further events in that window are only counted. When the window closes a
+    single digest ("N more in the last 5 min") is written to the outbox, so outbound
+    volume per channel stays bounded by the number of distinct errors, not their rate.
+
+    Windows live in the worker's memory, so each gunicorn worker sends its own first
+    message and digest per window. Decisions are staged per transaction and applied
+    after it commits, so a batch that is rolled back and retried is judged again from
+    the same state.
+    """
+
+    def __init__(self, window: float, maxsize: int, tick: float = 5):
+        self.window = window
+        self.maxsize = maxsize
+        self.tick = tick
+
+        self._windows: dict[tuple[int, str], _Window] = {}
+        self._closed: list[_Window] = []
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+
+        self.suppressed = 0
+        self.digests = 0
+
+    def stats(self) -> dict:
+        return {
+            "open_windows": len(self._windows),
+            "suppressed": self.suppressed,
+            "digests": self.digests,
+        }
+
+    def admit(self, route: Route, event: EventDB, staged: dict) -> bool:
+        """
+        Return True if the event should be notified on this route now.
+
+        The window changes are recorded in `staged` and take effect only when it is
+        passed to `apply`, once the events have been committed.
+        """
+        if self.window <= 0:
+            return True
+
+        now = time.monotonic()
+        key = (route.notification_id, event.fingerprint)
+        pending = staged.get(key)
+        if pending is None:
+            pending = staged[key] = _Pending(route, self._windows.get(key))
+
+        if pending.opened is not None:
+            if now < pending.opened.ends_at:
+                pending.opened.suppressed += 1
+                pending.opened.event = event
+                return False
+            if pending.opened.suppressed:
+                pending.closed.append(pending.opened)
+        elif pending.window is not None and now < pending.window.ends_at:
+            pending.suppressed += 1
+            pending.event = event
+            return False
+        elif pending.window is None and len(self._windows) >= self.maxsize:
+            return True
+        pending.opened = _Window(route, now + self.window, event)
+        return True
+
+    def apply(self, staged: dict) -> None:
+        """
+        Apply the window changes staged by `admit` for a committed transaction.
+        """
+        for key, pending in staged.items():
+            current = self._windows.get(key)
+            if pending.suppressed:
+                if current is not None and current is pending.window:
+                    current.suppressed += pending.suppressed
+                    current.event = pending.event
+                else:
+                    # The window was closed while the transaction ran; report its tail separately.
+                    tail = _Window(pending.route, 0, pending.event)
+                    tail.suppressed = pending.suppressed
+                    self._closed.append(tail)
+                self.suppressed += pending.suppressed
+            for window in pending.closed:
+                self._closed.append(window)
+                self.suppressed += window.suppressed
+            if pending.opened is not None:
+                if current is not None and current.suppressed:
+                    self._closed.append(current)
+                self._windows[key] = pending.opened
+                self.suppressed += pending.opened.suppressed
+
+    def pop_digests(self, force: bool = False) -> list[dict]:
+        """
+        Close finished windows (or all of them with `force`) and return outbox rows
+        for those that suppressed at least one event.
+        """
+        now = time.monotonic()
+        for key, window in list(self._windows.items()):
+            if force or now >= window.ends_at:
+                del self._windows[key]
+                if window.suppressed:
+                    self._closed.append(window)
+
+        closed, self._closed = self._closed, []
+        rows = []
+        for window in closed:
+            event = window.event
+            digest_data = {
+                "exception_type": event.type,
+                "exception_message": event.value,
+                "count": window.suppressed,
+                "window": self.window,
+                "last_seen": event.timestamp,
+            }
+            if window.route.type in SENDERS:
+                digest_data["channel"] = window.route.channel
+                digest_data["username"] = window.route.username
+            rows.append({
+                "notification_id": window.route.notification_id,
+                "payload": window.route.sender.format_digest(digest_data),
+            })
+        self.digests += len(rows)
+        return rows
+
+    async def start(self) -> None:
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+        await self._write(self.pop_digests(force=True))
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.tick)
+            except asyncio.TimeoutError:
+                pass
+            await self._write(self.pop_digests())
+
+    @staticmethod
+    async def _write(rows: list[dict]) -> None:
+        if not rows:
+            return
+        try:
+            async with get_session() as db_session:
+                await NotificationOutboxRepository(db_session).enqueue(rows)
+        except Exception as e:
+            logger.error(f"{len(rows)} notification digests were dropped: {e}")
+
+
+notification_coalescer = NotificationCoalescer(
+    window=Config.NOTIFICATION_COALESCE_WINDOW,
+    maxsize=Config.NOTIFICATION_COALESCE_MAX_WINDOWS,
+)
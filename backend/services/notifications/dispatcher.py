@@ -0,0 +1,88 @@
+import time
+
+import aiohttp
+
+from backend.services.notifications.base import WebhookSender
+from backend.services.utils.config import Config
+from backend.services.utils.logger import Logger
+from backend.services.utils.metrics import WEBHOOK_FAILURES, WEBHOOK_SECONDS
+
+logger = Logger(__name__)
+
+
+class DeliveryStats:
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        if ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def as_dict(self) -> dict:
+        attempts = self.sent + self.failed
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "latency_avg_ms": round(self.latency_total / attempts * 1000, 2) if attempts else 0.0,
+            "latency_max_ms": round(self.latency_max * 1000, 2),
+        }
+
+
+class WebhookDispatcher:
+    """
+    Sends webhook messages for the outbox worker.
+
+    Owns one long-lived aiohttp client per worker, so connections and TLS sessions are
+    pooled (at most `limit_per_host` concurrent connections to one host). `deliver`
+    sends one message and raises on failure; retries are left to the outbox.
+    """
+
+    def __init__(self, limit: int, limit_per_host: int, timeout: float):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+
+        self._session: aiohttp.ClientSession | None = None
+        self._stats: dict[str, DeliveryStats] = {}
+
+    async def start(self) -> None:
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+        self._session = aiohttp.ClientSession(connector=connector)
+
+    async def stop(self) -> None:
+        if self._session is None:
+            return
+        await self._session.close()
+        self._session = None
+
+    async def deliver(self, sender: WebhookSender, payload: dict) -> None:
+        stats = self._stats.setdefault(type(sender).__name__, DeliveryStats())
+        started = time.perf_counter()
+        try:
+            await sender.send(payload, timeout=self.timeout, session=self._session)
+        except Exception:
+            elapsed = time.perf_counter() - started
+            stats.record(elapsed, ok=False)
+            WEBHOOK_SECONDS.labels(sender.notification_type).observe(elapsed)
+            WEBHOOK_FAILURES.labels(sender.notification_type).inc()
+            raise
+        elapsed = time.perf_counter() - started
+        stats.record(elapsed, ok=True)
+        WEBHOOK_SECONDS.labels(sender.notification_type).observe(elapsed)
+
+    def stats(self) -> dict:
+        return {"senders": {name: stats.as_dict() for name, stats in self._stats.items()}}
+
+
+webhook_dispatcher = WebhookDispatcher(
+    limit=Config.WEBHOOK_CONNECTION_LIMIT,
+    limit_per_host=Config.WEBHOOK_LIMIT_PER_HOST,
+    timeout=Config.WEBHOOK_TIMEOUT,
+)
@@ -3,10 +3,12 @@ from backend.services.utils.config import Config
 
 
 class MattermostWebhookSender(WebhookSender):
+    notification_type = "mattermost"
+
     def __init__(self, url: str):
         super().__init__(url)
 
-    async def send_text(self, event_data: dict):
+    def format_event(self, event_data: dict) -> dict:
         event_url = "http://localhost:5175/issues"
         payload = {
             "text": "",
@@ -24,4 +26,28 @@ class MattermostWebhookSender(WebhookSender):
                 "footer_icon": "https://mattermost.com/wp-content/uploads/2022/02/icon.png"
             }]
         }
-        await self.send(payload)
+        if event_data.get("channel"):
+            payload["channel"] = event_data["channel"]
+        if event_data.get("username"):
+            payload["username"] = event_data["username"]
+        return payload
+
+    def format_digest(self, digest_data: dict) -> dict:
+        minutes = max(1, round(digest_data.get("window", 0) / 60))
+        payload = {
+            "text": "",
+            "attachments": [{
+                "title": f"🔁 {digest_data.get('exception_type') or 'Новая ошибка'}",
+                "text": f"Ещё {digest_data.get('count')} за последние {minutes} мин\n\n" +
+                        f"{digest_data.get('exception_message') or 'Без описания'}\n\n" +
+                        f"- **Последнее:** {digest_data.get('last_seen').strftime('%d.%m.%Y %H:%M:%S')}",
+                "color": "#FFA500",
+                "footer": "Digest",
+                "footer_icon": "https://mattermost.com/wp-content/uploads/2022/02/icon.png"
+            }]
+        }
+        if digest_data.get("channel"):
+            payload["channel"] = digest_data["channel"]
+        if digest_data.get("username"):
+            payload["username"] = digest_data["username"]
+        return payload
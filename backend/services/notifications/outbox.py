@@ -0,0 +1,147 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+from backend.schemas.db.event import EventDB
+from backend.services.notifications.coalescing import notification_coalescer
+from backend.services.notifications.dispatcher import webhook_dispatcher
+from backend.services.notifications.routing import build_sender, notification_router
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.notification_outbox.repository import NotificationOutboxRepository
+from backend.services.utils.config import Config
+from backend.services.utils.logger import Logger
+
+logger = Logger(__name__)
+
+
+async def build_outbox_rows(events: list[EventDB], staged: dict) -> list[dict]:
+    """
+    Return one outbox row per (event, configured notification) pair, ready to be
+    inserted in the same transaction as the events themselves. Repeats of an error
+    inside its coalescing window are left to the digest; the window changes go to
+    `staged` and must be applied with `notification_coalescer.apply` after the commit.
+    """
+    rows = []
+    for event in events:
+        for route in await notification_router.get_routes(event.project_uuid):
+            if not notification_coalescer.admit(route, event, staged):
+                continue
+            rows.append({
+                "notification_id": route.notification_id,
+                "payload": notification_router.format_event(route, event),
+            })
+    return rows
+
+
+class OutboxWorker:
+    """
+    Delivers messages from the notification_outbox table.
+
+    Every worker process runs one loop that claims due messages in batches with
+    FOR UPDATE SKIP LOCKED, sends them concurrently through the webhook dispatcher,
+    deletes the delivered ones and reschedules failures with exponential backoff and
+    jitter. After `max_attempts` a message is kept with failed_at set and no longer retried.
+    """
+
+    def __init__(self, batch_size: int, poll_interval: float, lease: float,
+                 max_attempts: int, base_delay: float, max_delay: float):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+
+        self.delivered = 0
+        self.retried = 0
+        self.dead = 0
+
+    def stats(self) -> dict:
+        return {
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
+
+    async def start(self) -> None:
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.process_batch()
+            except Exception as e:
+                logger.error(f"Outbox delivery loop failed: {e}")
+                claimed = 0
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def process_batch(self) -> int:
+        async with get_session() as db_session:
+            messages = await NotificationOutboxRepository(db_session).claim_batch(self.batch_size, self.lease)
+        if not messages:
+            return 0
+
+        results = await asyncio.gather(
+            *(self._deliver(message) for message in messages),
+            return_exceptions=True,
+        )
+
+        delivered, failures = [], []
+        now = datetime.now(timezone.utc)
+        for message, error in zip(messages, results):
+            if error is None:
+                delivered.append(message["id"])
+                continue
+            dead = message["attempts"] >= self.max_attempts
+            failures.append({
+                "id": message["id"],
+                "next_attempt_at": now + timedelta(seconds=self.backoff(message["attempts"])),
+                "last_error": str(error) or type(error).__name__,
+                "failed_at": now if dead else None,
+            })
+            if dead:
+                self.dead += 1
+                logger.error(f"Outbox message {message['id']} gave up after {message['attempts']} attempts: {error}")
+            else:
+                self.retried += 1
+
+        async with get_session() as db_session:
+            repo = NotificationOutboxRepository(db_session)
+            await repo.complete(delivered)
+            await repo.reschedule(failures)
+        self.delivered += len(delivered)
+        return len(messages)
+
+    @staticmethod
+    async def _deliver(message: dict) -> None:
+        sender = build_sender(message["type"], message["url"])
+        await webhook_dispatcher.deliver(sender, message["payload"])
+
+
+outbox_worker = OutboxWorker(
+    batch_size=Config.OUTBOX_BATCH_SIZE,
+    poll_interval=Config.OUTBOX_POLL_INTERVAL,
+    lease=Config.OUTBOX_LEASE,
+    max_attempts=Config.OUTBOX_MAX_ATTEMPTS,
+    base_delay=Config.OUTBOX_RETRY_BASE_DELAY,
+    max_delay=Config.OUTBOX_RETRY_MAX_DELAY,
+)
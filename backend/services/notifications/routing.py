@@ -0,0 +1,104 @@
+from typing import NamedTuple
+
+from backend.schemas.db.event import EventDB
+from backend.services.ingest.project_keys import normalize_key
+from backend.services.notifications.base import WebhookSender
+from backend.services.notifications.mattermost import MattermostWebhookSender
+from backend.services.notifications.slack import SlackWebhookSender
+from backend.services.sqlstore.database_session import get_session
+from backend.services.sqlstore.models.notifications.repository import NotificationRepository
+from backend.services.utils.config import Config
+from backend.services.utils.ttl_cache import TTLCache
+
+SENDERS = {
+    "mattermost": MattermostWebhookSender,
+    "slack": SlackWebhookSender,
+}
+
+
+def build_sender(notification_type: str | None, url: str) -> WebhookSender:
+    return SENDERS.get(notification_type, WebhookSender)(url)
+
+
+def build_event_data(event: EventDB) -> dict:
+    return {
+        "uuid": event.uuid,
+        "exception_type": event.type,
+        "exception_message": event.value,
+        "timestamp": event.timestamp,
+        "path": event.abs_path,
+        "server_name": event.server_name,
+        "severity": event.level,
+        "line": event.lineno
+    }
+
+
+class Route(NamedTuple):
+    notification_id: int
+    type: str | None
+    sender: WebhookSender
+    channel: str | None
+    username: str | None
+
+
+class NotificationRouter:
+    """
+    Per-worker cache of compiled notification routes keyed by project.
+
+    Routes are rebuilt from the database when a project is missing from the cache,
+    when the notifications router invalidates it after a write, or after `ttl`
+    seconds as a safety net for writes made by other workers.
+
+    Keys are normalized project keys: ingested events carry the dashless form while
+    the API and the database use the dashed one.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get_routes(self, project_uuid: str) -> list[Route]:
+        project_uuid = normalize_key(project_uuid) or project_uuid
+        routes = self._cache.get(project_uuid)
+        if routes is not None:
+            return routes
+
+        async with get_session() as db_session:
+            repo = NotificationRepository(db_session)
+            notifications = await repo.get_all(project_uuid=project_uuid)
+
+        routes = [self._compile(notification) for notification in notifications]
+        self._cache.set(project_uuid, routes)
+        return routes
+
+    def invalidate(self, project_uuid: str | None = None) -> None:
+        if project_uuid is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(normalize_key(project_uuid) or project_uuid)
+
+    @staticmethod
+    def _compile(notification: dict) -> Route:
+        return Route(
+            notification_id=notification.get("id"),
+            type=notification.get("type"),
+            sender=build_sender(notification.get("type"), notification.get("url")),
+            channel=notification.get("channel"),
+            username=notification.get("username"),
+        )
+
+    @staticmethod
+    def format_event(route: Route, event: EventDB) -> dict:
+        """
+        Build the webhook body of an event for one route.
+        """
+        event_data = build_event_data(event)
+        if route.type in SENDERS:
+            event_data["channel"] = route.channel
+            event_data["username"] = route.username
+        return route.sender.format_event(event_data)
+
+
+notification_router = NotificationRouter(
+    maxsize=Config.NOTIFICATION_ROUTES_CACHE_SIZE,
+    ttl=Config.NOTIFICATION_ROUTES_TTL,
+)
@@ -2,9 +2,37 @@ from backend.services.notifications.base import WebhookSender
 
 
 class SlackWebhookSender(WebhookSender):
+    notification_type = "slack"
+
     def __init__(self, url: str):
         super().__init__(url)
 
+    def format_event(self, event_data: dict) -> dict:
+        timestamp = event_data.get("timestamp")
+        return {
+            "text": f"🚨 {event_data.get('exception_type') or 'Новая ошибка'}",
+            "attachments": [{
+                "color": "#FF0000",
+                "text": f"{event_data.get('exception_message') or 'Без описания'}\n" +
+                        f"*Время:* {timestamp.strftime('%d.%m.%Y %H:%M:%S') if timestamp else 'N/A'}\n" +
+                        f"*Файл:* {event_data.get('path', 'N/A')}:{event_data.get('line', 'N/A')}\n" +
+                        f"*Сервер:* {event_data.get('server_name', 'N/A')}",
+                "footer": f"Severity: {(event_data.get('severity') or 'unknown').upper()}",
+            }]
+        }
+
+    def format_digest(self, digest_data: dict) -> dict:
+        minutes = max(1, round(digest_data.get("window", 0) / 60))
+        return {
+            "text": f"🔁 {digest_data.get('exception_type') or 'Новая ошибка'}: " +
+                    f"ещё {digest_data.get('count')} за последние {minutes} мин",
+            "attachments": [{
+                "color": "#FFA500",
+                "text": f"{digest_data.get('exception_message') or 'Без описания'}\n" +
+                        f"*Последнее:* {digest_data.get('last_seen').strftime('%d.%m.%Y %H:%M:%S')}",
+            }]
+        }
+
     async def send_text(self, text: str):
         payload = {"text": text}
         await self.send(payload)
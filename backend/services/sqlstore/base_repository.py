@@ -1,6 +1,11 @@
+import asyncpg
 from sqlalchemy import insert, select, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.services.utils.config import Config
+
 
 def orm_to_dict(obj):
     return {column.name: getattr(obj, column.name) for column in obj.__table__.columns}
@@ -8,6 +13,7 @@ def orm_to_dict(obj):
 
 class SQLAlchemyRepository:
     model = None
+    copy_threshold = Config.DB_COPY_THRESHOLD
 
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -25,6 +31,97 @@ class SQLAlchemyRepository:
         await self.session.commit()
         return res.scalar_one_or_none()
 
+    async def add_many(self, rows: list[dict], on_conflict: str | None = None,
+                       returning: bool = False, commit: bool = True) -> list | None:
+        """
+        Insert many rows in as few round-trips as possible.
+
+        Rows are sent as a multi-row executemany INSERT. Large plain batches
+        (at least `copy_threshold` rows, no conflict handling, no returned keys)
+        go through asyncpg's binary COPY FROM STDIN instead.
+
+        Parameters:
+            rows (list[dict]): Column values for every row; all rows must share the same keys.
+            on_conflict (str | None): None to fail on duplicates, "ignore" to skip rows whose
+                primary key already exists, "update" to overwrite the non-key columns.
+            returning (bool): Return the primary keys of the rows actually inserted.
+            commit (bool): Commit the session afterwards.
+
+        Returns:
+            list | None: Inserted keys (scalars, or tuples for composite keys) when `returning`
+            is set, otherwise None.
+        """
+        if on_conflict not in (None, "ignore", "update"):
+            raise ValueError(f"Unknown on_conflict mode: {on_conflict}")
+        if not rows:
+            return [] if returning else None
+
+        if on_conflict is None and not returning and len(rows) >= self.copy_threshold:
+            await self._copy_many(rows)
+            if commit:
+                await self.session.commit()
+            return None
+
+        table = self.model.__table__
+        key_columns = list(table.primary_key.columns)
+        stmt = pg_insert(table)
+        if on_conflict is not None:
+            update_columns = {
+                column.name: stmt.excluded[column.name]
+                for column in table.columns
+                if not column.primary_key and column.name in rows[0]
+            }
+            if on_conflict == "update" and update_columns:
+                stmt = stmt.on_conflict_do_update(index_elements=key_columns, set_=update_columns)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=key_columns)
+
+        keys = None
+        if returning:
+            res = await self.session.execute(stmt.returning(*key_columns), rows)
+            if len(key_columns) == 1:
+                keys = list(res.scalars().all())
+            else:
+                keys = [tuple(row) for row in res.all()]
+        else:
+            await self.session.execute(stmt, rows)
+
+        if commit:
+            await self.session.commit()
+        return keys
+
+    async def _copy_many(self, rows: list[dict]) -> None:
+        table = self.model.__table__
+        columns = [
+            column for column in table.columns
+            if column.name in rows[0] or (column.default is not None and not column.default.is_sequence)
+        ]
+        records = []
+        for row in rows:
+            record = []
+            for column in columns:
+                if column.name in row:
+                    record.append(row[column.name])
+                elif column.default.is_callable:
+                    record.append(column.default.arg(None))
+                else:
+                    record.append(column.default.arg)
+            records.append(tuple(record))
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        try:
+            await raw_connection.driver_connection.copy_records_to_table(
+                table.name,
+                records=records,
+                columns=[column.name for column in columns],
+                schema_name=table.schema,
+            )
+        except asyncpg.IntegrityConstraintViolationError as e:
+            # COPY bypasses SQLAlchemy, so callers would otherwise see a driver exception
+            # instead of the IntegrityError that the INSERT path raises.
+            raise IntegrityError(f"COPY {table.name}", None, e) from e
+
     async def update_one(self, filters: dict, data: dict) -> int | str | None:
         table = self.model.__table__
         if hasattr(self.model, 'id'):
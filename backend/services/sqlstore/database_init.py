@@ -2,6 +2,10 @@ from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase
 
 from backend.services.sqlstore.database_session import get_engine
+from backend.services.sqlstore.migrations import upgrade_schema
+from backend.services.sqlstore.models.stats.model import create_event_stats
+from backend.services.sqlstore.search import add_search_vector, enable_pg_trgm
+from backend.services.sqlstore.timescale import enable_timescale, setup_events_hypertable
 from importlib import import_module
 
 from backend.services.utils.logger import Logger
@@ -13,6 +17,16 @@ class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 
+def create_indexes(sync_conn) -> None:
+    """
+    Create the model indexes that are missing on tables which already existed,
+    `create_all` only adds indexes together with a new table.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def init_db() -> None:
     """
     Initializes the database by creating all tables
@@ -23,14 +37,20 @@ async def init_db() -> None:
     runs the necessary synchronization to create
     all the tables defined in the Base metadata.
     The tables are created using the `run_sync` method
-    of the connection object.
+    of the connection object. pg_trgm is loaded first for the
+    trigram indexes. Tables left by an older version are then
+    upgraded (see `upgrade_schema`). When TimescaleDB is available,
+    `events` is then converted into a compressed hypertable.
 
     Returns:
         None
     """
 
+    import_module("backend.services.sqlstore.models.event_samples.model")
     import_module("backend.services.sqlstore.models.events.model")
+    import_module("backend.services.sqlstore.models.issues.model")
     import_module("backend.services.sqlstore.models.notifications.model")
+    import_module("backend.services.sqlstore.models.notification_outbox.model")
     import_module("backend.services.sqlstore.models.projects.model")
     import_module("backend.services.sqlstore.models.sessions.model")
     import_module("backend.services.sqlstore.models.user_projects.model")
@@ -39,6 +59,11 @@ async def init_db() -> None:
     engine = await get_engine()
 
     async with engine.begin() as conn:
+        await enable_timescale(conn)
+        await enable_pg_trgm(conn)
         await conn.run_sync(Base.metadata.create_all)
-
-    await engine.dispose(False)
+        await upgrade_schema(conn)
+        await add_search_vector(conn)
+        await conn.run_sync(create_indexes)
+        await setup_events_hypertable(conn)
+        await create_event_stats(conn)
@@ -1,17 +1,21 @@
 from contextlib import asynccontextmanager
 import importlib
 import os
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from backend.services.utils.config import Config
+from backend.services.utils.metrics import instrument_pool
 
 SQLALCHEMY_DATABASE_URL = ("postgresql+asyncpg://"
                            f"{Config.DB_USER}:{Config.DB_PASSWORD}@{Config.DB_HOST}"  # noqa
                            f":{Config.DB_PORT}/{Config.DB_NAME}"
                            )  # noqa
 
+_engine: AsyncEngine | None = None
+_session_factory: sessionmaker | None = None
+
 
 async def cook_models():
     """
@@ -32,6 +36,9 @@ async def cook_models():
 async def get_session():
     """
     An asynchronous context manager to get a session, handle exceptions, and clean up resources.
+
+    Sessions are created from the process-wide session factory, so the underlying
+    connection is checked out of the shared pool and returned to it on exit.
     """
     engine = await get_engine()
     async_session_factory = await get_session_factory(engine)
@@ -44,29 +51,39 @@ async def get_session():
             raise
         finally:
             await db_session.close()
-            await engine.dispose()
 
 
-async def get_engine():
+async def get_engine() -> AsyncEngine:
     """
-    Create and return an asynchronous database engine.
+    Return the process-wide asynchronous database engine, creating it on first use.
 
-    This function initializes an asynchronous engine using the SQLALCHEMY_DATABASE_URL
-    and sets the future flag to True.
+    The engine owns a connection pool sized by the DB_POOL_* settings. It is created
+    lazily so that every gunicorn worker builds its own pool after forking, and it
+    lives until `dispose_engine` is called on application shutdown.
 
     Returns:
-        AsyncEngine: The initialized asynchronous database engine.
+        AsyncEngine: The shared asynchronous database engine.
     """
-    engine = create_async_engine(
-        SQLALCHEMY_DATABASE_URL,
-        future=True
-    )
-    return engine
-
-
-async def get_session_factory(engine):
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(
+            SQLALCHEMY_DATABASE_URL,
+            future=True,
+            pool_size=Config.DB_POOL_SIZE,
+            max_overflow=Config.DB_MAX_OVERFLOW,
+            pool_timeout=Config.DB_POOL_TIMEOUT,
+            pool_recycle=Config.DB_POOL_RECYCLE,
+            pool_pre_ping=Config.DB_POOL_PRE_PING,
+        )
+        instrument_pool(_engine.sync_engine.pool)
+    return _engine
+
+
+async def get_session_factory(engine: AsyncEngine):
     """
-    Create and return an asynchronous session factory for the given database engine.
+    Return the asynchronous session factory bound to the given database engine.
+
+    The factory is built once and reused for as long as it stays bound to the same engine.
 
     Parameters:
         engine (AsyncEngine): The database engine to bind the session factory to.
@@ -74,10 +91,26 @@ async def get_session_factory(engine):
     Returns:
         AsyncSessionFactory: An asynchronous session factory that can be used to create sessions.
     """
-    async_session_factory = sessionmaker(
-        bind=engine,
-        expire_on_commit=False,
-        class_=AsyncSession
-    )
+    global _session_factory
+    if _session_factory is None or _session_factory.kw.get("bind") is not engine:
+        _session_factory = sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            class_=AsyncSession
+        )
 
-    return async_session_factory
+    return _session_factory
+
+
+async def dispose_engine() -> None:
+    """
+    Close every pooled connection and drop the process-wide engine.
+
+    Called once from the application lifespan on shutdown. A later `get_session`
+    call would transparently create a fresh engine.
+    """
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
@@ -0,0 +1,90 @@
+"""
+Check that the hot queries can be served from indexes.
+
+Runs every query below under EXPLAIN with sequential scans disabled and fails
+if the planner still has to fall back to one, which means no usable index exists.
+
+Usage:
+    python -m backend.services.sqlstore.explain_check
+"""
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, text
+
+from backend.services.sqlstore.database_session import dispose_engine, get_session
+from backend.services.sqlstore.models.events.model import Event
+from backend.services.sqlstore.models.events.repository import EventRepository
+from backend.services.sqlstore.models.issues.model import Issue
+from backend.services.sqlstore.models.notifications.model import Notification
+from backend.services.sqlstore.models.projects.model import Project
+from backend.services.sqlstore.models.sessions.model import Session
+from backend.services.sqlstore.models.users.model import User
+from backend.services.utils.logger import Logger
+
+logger = Logger(__name__)
+
+SAMPLE_UUID = "00000000000000000000000000000000"
+
+
+def hot_queries() -> dict:
+    now = datetime.now(timezone.utc)
+    events_page = (
+        select(Event, Project.title)
+        .join(Project, Project.uuid == Event.project_uuid)
+        .order_by(Event.timestamp.desc(), Event.uuid.desc())
+        .limit(101)
+    )
+    return {
+        "events page (admin)": events_page,
+        "events page (user)": EventRepository._filtered(events_page, user_id=1),
+        "events page (project, time range)": EventRepository._filtered(
+            events_page, project_uuid=SAMPLE_UUID, since=now - timedelta(days=1), until=now
+        ),
+        "notifications by project": select(Notification).where(Notification.project_uuid == SAMPLE_UUID),
+        "sessions by user": select(Session).where(Session.user_id == 1),
+        "expired sessions": select(Session.uuid).where(Session.expires_at < now),
+        "session by uuid": select(Session).where(Session.uuid == SAMPLE_UUID).limit(1),
+        "user by id": select(User).where(User.id == 1).limit(1),
+        "events search": EventRepository.search_statement("division by zero", 50),
+        "issues page": select(Issue).order_by(Issue.last_seen.desc()).limit(100),
+        "issues by project": select(Issue).where(Issue.project_uuid == SAMPLE_UUID)
+        .order_by(Issue.last_seen.desc()).limit(100),
+    }
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+async def check() -> bool:
+    ok = True
+    async with get_session() as db_session:
+        await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+        dialect = db_session.bind.dialect
+        for name, stmt in hot_queries().items():
+            compiled = stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+            result = await db_session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scans = find_seq_scans(plan[0]["Plan"])
+            if scans:
+                ok = False
+                logger.error(f"{name}: sequential scan on {', '.join(scans)}")
+            else:
+                logger.info(f"{name}: ok")
+        await db_session.rollback()
+    await dispose_engine()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check()) else 1)
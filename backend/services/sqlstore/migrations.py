@@ -0,0 +1,111 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.services.utils.fingerprint import get_fingerprint
+from backend.services.utils.logger import Logger
+
+logger = Logger(__name__)
+
+FINGERPRINT_BATCH_SIZE = 5000
+
+
+async def upgrade_schema(conn: AsyncConnection) -> None:
+    """
+    Bring tables created by an older version up to the current models.
+
+    `create_all` only creates missing tables, so columns and keys added to existing
+    ones are applied here. Runs after `create_all` (issues must exist) and before the
+    indexes and the hypertable are set up. Every step checks the catalog first, so it
+    is a no-op on an up-to-date database.
+    """
+    await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS rate_limit double precision"))
+    await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS rate_burst integer"))
+    await _add_event_fingerprints(conn)
+    await _extend_events_primary_key(conn)
+
+
+async def _add_event_fingerprints(conn: AsyncConnection) -> None:
+    """
+    Add events.fingerprint, group the stored events into issues and then enforce the
+    NOT NULL and foreign key constraints of the model.
+
+    Older events only keep their innermost frame, so that is all the fingerprint can
+    use, the same as for imported exports.
+    """
+    exists = await conn.scalar(text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'events' AND column_name = 'fingerprint'"
+    ))
+    if exists:
+        return
+
+    logger.warning("Grouping existing events into issues, this rewrites the events table once")
+    await conn.execute(text("ALTER TABLE events ADD COLUMN fingerprint varchar(64)"))
+
+    after = None
+    while True:
+        # Keyset pagination over the primary key, which is still events.uuid alone here.
+        result = await conn.execute(
+            text(
+                "SELECT uuid, project_uuid, type, value, module, function FROM events "
+                f"{'WHERE uuid > CAST(:after AS uuid) ' if after else ''}"
+                "ORDER BY uuid LIMIT :limit"
+            ),
+            {"after": after, "limit": FINGERPRINT_BATCH_SIZE},
+        )
+        rows = result.all()
+        if not rows:
+            break
+        fingerprints = [
+            get_fingerprint(
+                str(row.project_uuid).replace("-", ""),
+                row.type,
+                row.value,
+                [{"module": row.module, "function": row.function}],
+            )
+            for row in rows
+        ]
+        await conn.execute(
+            text(
+                "UPDATE events SET fingerprint = batch.fingerprint "
+                "FROM unnest(CAST(:uuids AS uuid[]), CAST(:fingerprints AS varchar[])) "
+                "AS batch(uuid, fingerprint) WHERE events.uuid = batch.uuid"
+            ),
+            {"uuids": [str(row.uuid) for row in rows], "fingerprints": fingerprints},
+        )
+        after = str(rows[-1].uuid)
+
+    await conn.execute(text(
+        "INSERT INTO issues (fingerprint, project_uuid, type, value, function, module, filename, "
+        "first_seen, last_seen, count) "
+        "SELECT latest.fingerprint, latest.project_uuid, latest.type, latest.value, latest.function, "
+        "latest.module, latest.filename, totals.first_seen, totals.last_seen, totals.count "
+        "FROM (SELECT DISTINCT ON (fingerprint) * FROM events ORDER BY fingerprint, timestamp DESC) AS latest "
+        "JOIN (SELECT fingerprint, min(timestamp) AS first_seen, max(timestamp) AS last_seen, "
+        "count(*) AS count FROM events GROUP BY fingerprint) AS totals USING (fingerprint) "
+        "ON CONFLICT (fingerprint) DO NOTHING"
+    ))
+    await conn.execute(text("ALTER TABLE events ALTER COLUMN fingerprint SET NOT NULL"))
+    await conn.execute(text(
+        "ALTER TABLE events ADD CONSTRAINT events_fingerprint_fkey "
+        "FOREIGN KEY (fingerprint) REFERENCES issues (fingerprint) ON DELETE CASCADE"
+    ))
+
+
+async def _extend_events_primary_key(conn: AsyncConnection) -> None:
+    """
+    Replace a primary key on events.uuid alone with (uuid, timestamp). TimescaleDB
+    requires the partitioning column in every unique index of a hypertable.
+    """
+    result = await conn.execute(text(
+        "SELECT c.conname, array_agg(a.attname::text) FROM pg_constraint AS c "
+        "JOIN pg_attribute AS a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey) "
+        "WHERE c.conrelid = 'events'::regclass AND c.contype = 'p' GROUP BY c.conname"
+    ))
+    primary_key = result.first()
+    if primary_key is None or "timestamp" in primary_key[1]:
+        return
+
+    logger.warning("Extending the events primary key with timestamp")
+    await conn.execute(text(f'ALTER TABLE events DROP CONSTRAINT "{primary_key[0]}"'))
+    await conn.execute(text("ALTER TABLE events ADD PRIMARY KEY (uuid, timestamp)"))
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from backend.services.sqlstore.database_init import Base
+
+
+class EventSample(Base):
+    """
+    Occurrences of one issue within one spike protection window: how many events
+    were seen and how many of them were dropped instead of being stored.
+    """
+    __tablename__ = "event_samples"
+
+    fingerprint: str = Column(String(64), ForeignKey("issues.fingerprint", ondelete="CASCADE"), primary_key=True)
+    bucket: datetime = Column(DateTime(timezone=True), primary_key=True)
+    project_uuid: str = Column(UUID(as_uuid=False), ForeignKey("projects.uuid", ondelete="CASCADE"),
+                               nullable=False, index=True)
+
+    seen: int = Column(BigInteger, nullable=False, default=0)
+    dropped: int = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<EventSample fingerprint={self.fingerprint} bucket={self.bucket} dropped={self.dropped}>"
@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from backend.schemas.db.event import EventDB
+from backend.services.sqlstore.base_repository import SQLAlchemyRepository
+from backend.services.sqlstore.models.event_samples.model import EventSample
+from backend.services.sqlstore.models.user_projects.model import UserProject
+
+
+class EventSampleRepository(SQLAlchemyRepository):
+    model = EventSample
+
+    async def sample(self, events: list[EventDB], limit: int, window: int, commit: bool = True) -> list[EventDB]:
+        """
+        Count a batch of events per (fingerprint, window) and return the ones to store.
+
+        The first `limit` events of an issue in each window are kept, the rest are
+        only added to `dropped`. Counting happens in the database with a single
+        INSERT ... ON CONFLICT ... RETURNING, so the limit holds across workers.
+        A `limit` or `window` of 0 disables sampling.
+        """
+        if limit <= 0 or window <= 0 or not events:
+            return events
+
+        groups: dict[tuple[str, datetime], list[EventDB]] = {}
+        for event in events:
+            groups.setdefault((event.fingerprint, _bucket(event.timestamp, window)), []).append(event)
+
+        rows = [
+            {
+                "fingerprint": fingerprint,
+                "bucket": bucket,
+                "project_uuid": group[0].project_uuid,
+                "seen": len(group),
+                "dropped": max(0, len(group) - limit),
+            }
+            for (fingerprint, bucket), group in sorted(groups.items())
+        ]
+        table = EventSample.__table__
+        stmt = pg_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.fingerprint, table.c.bucket],
+            set_={
+                "seen": table.c.seen + stmt.excluded.seen,
+                # Of this batch, whatever does not fit under the limit after the events seen before it.
+                "dropped": table.c.dropped + func.greatest(
+                    0, func.least(stmt.excluded.seen, table.c.seen + stmt.excluded.seen - limit)
+                ),
+            },
+        ).returning(table.c.fingerprint, table.c.bucket, table.c.seen)
+        result = await self.session.execute(stmt)
+
+        kept = []
+        for fingerprint, bucket, seen in result.all():
+            group = groups[(fingerprint, bucket)]
+            seen_before = seen - len(group)
+            kept.extend(group[:max(0, limit - seen_before)])
+        if commit:
+            await self.session.commit()
+        return kept
+
+    async def get_issue_samples(self, fingerprint: str, user_id: int | None = None) -> list[dict]:
+        stmt = (
+            select(EventSample.bucket, EventSample.seen, EventSample.dropped)
+            .where(EventSample.fingerprint == fingerprint)
+            .order_by(EventSample.bucket.desc())
+        )
+        if user_id is not None:
+            stmt = (
+                stmt.join(UserProject, UserProject.project_uuid == EventSample.project_uuid)
+                .where(UserProject.user_id == user_id)
+            )
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+
+def _bucket(timestamp: datetime, window: int) -> datetime:
+    seconds = int(timestamp.timestamp())
+    return datetime.fromtimestamp(seconds - seconds % window, tz=timezone.utc)
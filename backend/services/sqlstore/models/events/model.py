@@ -1,8 +1,8 @@
 from datetime import datetime
 
-from sqlalchemy import Column, String, ForeignKey, Text, Integer, DateTime
+from sqlalchemy import Column, String, ForeignKey, Text, Integer, DateTime, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 
 from backend.services.sqlstore.database_init import Base
 
@@ -12,6 +12,7 @@ class Event(Base):
 
     uuid: str = Column(UUID(as_uuid=False), primary_key=True)
     project_uuid: str = Column(UUID(as_uuid=False), ForeignKey("projects.uuid"), nullable=False)
+    fingerprint: str = Column(String(64), ForeignKey("issues.fingerprint", ondelete="CASCADE"), nullable=False)
 
     type: str = Column(String(255))
     value: str = Column(Text)
@@ -31,9 +32,26 @@ class Event(Base):
     platform: str | None = Column(String(255))
     server_name: str | None = Column(String(255))
 
-    timestamp: datetime = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    # Part of the primary key because TimescaleDB requires the partitioning column in every unique index.
+    timestamp: datetime = Column(DateTime(timezone=True), default=datetime.utcnow, primary_key=True)
+
+    # Filled by the events_search_vector trigger (see sqlstore/search.py), never written
+    # or returned by the application.
+    search_vector = Column(TSVECTOR, info={"internal": True})
 
     project = relationship("Project", back_populates="events")
+    issue = relationship("Issue", back_populates="events")
 
     def __repr__(self) -> str:
         return f"<Event uuid={self.uuid} project={self.project_uuid}>"
+
+
+# Keyset pagination over all events, the per-project list/filter path and the per-issue drill-down.
+Index("ix_events_timestamp_uuid", Event.timestamp.desc(), Event.uuid.desc())
+Index("ix_events_project_uuid_timestamp", Event.project_uuid, Event.timestamp.desc())
+Index("ix_events_fingerprint_timestamp", Event.fingerprint, Event.timestamp.desc())
+
+# Full-text search, plus trigram indexes for substring and prefix matches on the exception type and path.
+Index("ix_events_search_vector", Event.search_vector, postgresql_using="gin")
+Index("ix_events_type_trgm", Event.type, postgresql_using="gin", postgresql_ops={"type": "gin_trgm_ops"})
+Index("ix_events_abs_path_trgm", Event.abs_path, postgresql_using="gin", postgresql_ops={"abs_path": "gin_trgm_ops"})
@@ -1,56 +1,173 @@
-from sqlalchemy import select
+import json
+from datetime import datetime
+
+from typing import AsyncIterator
+
+from sqlalchemy import Select, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.engine import RowMapping
 
 from backend.services.sqlstore.base_repository import SQLAlchemyRepository
 from backend.services.sqlstore.models.events.model import Event
 from backend.services.sqlstore.models.projects.model import Project
 from backend.services.sqlstore.models.user_projects.model import UserProject
+from backend.services.sqlstore.search import SEARCH_CONFIG
 
 
-def orm_to_dict(obj):
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+# What the event lists need; context and the runtime details are only loaded by get_event.
+SUMMARY_COLUMNS = (
+    Event.uuid,
+    Event.project_uuid,
+    Event.fingerprint,
+    Event.type,
+    Event.value,
+    Event.level,
+    Event.timestamp,
+    Event.filename,
+    Event.function,
+    Event.lineno,
+    Event.platform,
+    Event.server_name,
+)
+
+DETAIL_COLUMNS = tuple(column for column in Event.__table__.columns if not column.info.get("internal"))
 
 
 class EventRepository(SQLAlchemyRepository):
     model = Event
 
-    async def get_events_for_user(self, user_id: int) -> list[dict]:
-        stmt = (
-            select(
-                Event,
-                Project.uuid.label("project_uuid"),
-                Project.title.label("project_title")
+    @staticmethod
+    def _filtered(stmt: Select, user_id: int | None = None, project_uuid: str | None = None,
+                  level: str | None = None, exception_type: str | None = None,
+                  server_name: str | None = None, since: datetime | None = None,
+                  until: datetime | None = None) -> Select:
+        if user_id is not None:
+            stmt = (
+                stmt.join(UserProject, UserProject.project_uuid == Event.project_uuid)
+                .where(UserProject.user_id == user_id)
             )
-            .join(Project, Project.uuid == Event.project_uuid)
-            .join(UserProject, UserProject.project_uuid == Project.uuid)
-            .where(UserProject.user_id == user_id)
-            .order_by(Event.timestamp.desc())
+        if project_uuid is not None:
+            stmt = stmt.where(Event.project_uuid == project_uuid)
+        if level is not None:
+            stmt = stmt.where(Event.level == level)
+        if exception_type is not None:
+            stmt = stmt.where(Event.type == exception_type)
+        if server_name is not None:
+            stmt = stmt.where(Event.server_name == server_name)
+        if since is not None:
+            stmt = stmt.where(Event.timestamp >= since)
+        if until is not None:
+            stmt = stmt.where(Event.timestamp < until)
+        return stmt
+
+    async def get_events_page(self, limit: int, cursor: tuple[datetime, str] | None = None,
+                              **filters) -> tuple[list[dict], tuple[datetime, str] | None]:
+        """
+        Return one page of event summaries, newest first, using keyset pagination on (timestamp, uuid).
+
+        Parameters:
+            limit (int): Page size.
+            cursor (tuple[datetime, str] | None): (timestamp, uuid) of the last event of the previous page.
+            **filters: user_id, project_uuid, level, exception_type, server_name, since, until.
+
+        Returns:
+            tuple[list[dict], tuple[datetime, str] | None]: The events and the cursor of the next
+            page, or None when this is the last page.
+        """
+        stmt = self._filtered(
+            select(*SUMMARY_COLUMNS, Project.title.label("project_title"))
+            .join(Project, Project.uuid == Event.project_uuid),
+            **filters
         )
+        if cursor is not None:
+            stmt = stmt.where(tuple_(Event.timestamp, Event.uuid) < cursor)
+        stmt = stmt.order_by(Event.timestamp.desc(), Event.uuid.desc()).limit(limit + 1)
 
         result = await self.session.execute(stmt)
+        events = [dict(row) for row in result.mappings().all()]
+
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = (events[-1]["timestamp"], events[-1]["uuid"])
+        return events, next_cursor
 
-        events: list[dict] = []
-        for event_obj, proj_uuid, proj_title in result.all():
-            row = orm_to_dict(event_obj)
-            row["project_uuid"] = proj_uuid
-            row["project_title"] = proj_title
-            events.append(row)
+    async def stream_events(self, columns: list[str], batch_size: int,
+                            **filters) -> AsyncIterator[list[RowMapping]]:
+        """
+        Yield the filtered events oldest first, `batch_size` rows at a time, from a
+        server-side cursor, so memory stays constant however many rows match.
+        """
+        stmt = self._filtered(select(*(Event.__table__.c[name] for name in columns)), **filters)
+        stmt = stmt.order_by(Event.timestamp, Event.uuid).execution_options(yield_per=batch_size)
 
-        return events
+        result = await self.session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield partition
 
-    async def get_events_with_project_title(self) -> list[dict]:
-        stmt = (
-            select(Event, Project.title)
+    async def search(self, query: str, limit: int, offset: int = 0, **filters) -> list[dict]:
+        """
+        Return event summaries matching `query`, best match first.
+        """
+        result = await self.session.execute(self.search_statement(query, limit, offset, **filters))
+        return [dict(row) for row in result.mappings().all()]
+
+    @staticmethod
+    def search_statement(query: str, limit: int, offset: int = 0, **filters) -> Select:
+        """
+        An event matches when its search_vector matches the query as parsed by
+        websearch_to_tsquery, or when its exception type or path contains the query
+        as a substring; the GIN and trigram indexes serve all three conditions.
+        """
+        tsquery = func.websearch_to_tsquery(literal(SEARCH_CONFIG).cast(REGCONFIG), query)
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        rank = (
+            func.ts_rank_cd(Event.search_vector, tsquery)
+            + func.similarity(func.coalesce(Event.type, ""), query)
+        ).label("rank")
+
+        stmt = EventRepository._filtered(
+            select(*SUMMARY_COLUMNS, Project.title.label("project_title"), rank)
             .join(Project, Project.uuid == Event.project_uuid)
-            .order_by(Event.timestamp.desc())
+            .where(or_(
+                Event.search_vector.op("@@")(tsquery),
+                Event.type.ilike(pattern),
+                Event.abs_path.ilike(pattern),
+            )),
+            **filters
         )
+        return stmt.order_by(rank.desc(), Event.timestamp.desc(), Event.uuid.desc()).limit(limit).offset(offset)
 
-        result = await self.session.execute(stmt)
-
-        events: list[dict] = []
-        for event_obj, project_title in result.all():
-            row = orm_to_dict(event_obj)
-            row["project_title"] = project_title
-            events.append(row)
+    async def get_event(self, uuid: str, user_id: int | None = None) -> dict | None:
+        """
+        Return every column of one event, or None if it does not exist or,
+        with `user_id`, belongs to a project the user is not a member of.
+        """
+        stmt = self._filtered(
+            select(*DETAIL_COLUMNS, Project.title.label("project_title"))
+            .join(Project, Project.uuid == Event.project_uuid)
+            .where(Event.uuid == uuid),
+            user_id=user_id,
+        )
+        result = await self.session.execute(stmt.limit(1))
+        row = result.mappings().first()
+        return dict(row) if row else None
 
-        print(events)
-        return events
+    async def estimate_count(self, **filters) -> int:
+        """
+        Return the planner's row estimate for the filtered events instead of an exact COUNT(*),
+        so the cost does not grow with the table.
+        """
+        stmt = self._filtered(select(Event.uuid), **filters)
+        # Sent as driver SQL with the compiled parameters: text() would re-parse ":name"
+        # inside user-supplied values as bind parameters.
+        compiled = stmt.compile(dialect=self.session.bind.dialect)
+        params = compiled.construct_params()
+        connection = await self.session.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", tuple(params[name] for name in compiled.positiontup)
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
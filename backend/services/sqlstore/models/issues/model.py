@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, String, ForeignKey, Text, DateTime, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+
+from backend.services.sqlstore.database_init import Base
+
+
+class Issue(Base):
+    __tablename__ = "issues"
+
+    fingerprint: str = Column(String(64), primary_key=True)
+    project_uuid: str = Column(UUID(as_uuid=False), ForeignKey("projects.uuid", ondelete="CASCADE"), nullable=False)
+
+    type: str | None = Column(String(255))
+    value: str | None = Column(Text)
+    function: str | None = Column(String(255))
+    module: str | None = Column(String(255))
+    filename: str | None = Column(Text)
+
+    first_seen: datetime = Column(DateTime(timezone=True), nullable=False)
+    last_seen: datetime = Column(DateTime(timezone=True), nullable=False)
+    count: int = Column(BigInteger, nullable=False, default=0)
+
+    project = relationship("Project", back_populates="issues")
+    events = relationship("Event", back_populates="issue")
+
+    def __repr__(self) -> str:
+        return f"<Issue fingerprint={self.fingerprint} project={self.project_uuid} count={self.count}>"
+
+
+Index("ix_issues_last_seen", Issue.last_seen.desc())
+Index("ix_issues_project_uuid_last_seen", Issue.project_uuid, Issue.last_seen.desc())
@@ -0,0 +1,109 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from backend.schemas.db.event import EventDB
+from backend.services.sqlstore.base_repository import SQLAlchemyRepository
+from backend.services.sqlstore.models.issues.model import Issue
+from backend.services.sqlstore.models.projects.model import Project
+from backend.services.sqlstore.models.user_projects.model import UserProject
+
+
+class IssueRepository(SQLAlchemyRepository):
+    model = Issue
+
+    async def upsert_many(self, events: list[EventDB], commit: bool = True) -> None:
+        """
+        Create or update the issues of a batch of events with a single INSERT ... ON CONFLICT.
+
+        Events are folded per fingerprint first, because one statement cannot touch
+        the same row twice. Rows are sorted by fingerprint so concurrent workers
+        lock them in the same order.
+        """
+        issues = self._fold(events)
+        if not issues:
+            return
+
+        table = Issue.__table__
+        stmt = pg_insert(table).values(issues)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.fingerprint],
+            set_={
+                "first_seen": func.least(table.c.first_seen, stmt.excluded.first_seen),
+                "last_seen": func.greatest(table.c.last_seen, stmt.excluded.last_seen),
+                "count": table.c.count + stmt.excluded.count,
+                "value": case(
+                    (stmt.excluded.last_seen >= table.c.last_seen, stmt.excluded.value),
+                    else_=table.c.value,
+                ),
+            },
+        )
+        await self.session.execute(stmt)
+        if commit:
+            await self.session.commit()
+
+    async def add_missing(self, events: list[EventDB], commit: bool = True) -> None:
+        """
+        Create the issues of a batch of events that do not exist yet, with a count of zero.
+
+        Lets events be inserted before it is known which of them are new; `upsert_many`
+        then counts only the ones that were.
+        """
+        issues = self._fold(events)
+        if not issues:
+            return
+        for issue in issues:
+            issue["count"] = 0
+        stmt = pg_insert(Issue.__table__).values(issues).on_conflict_do_nothing(
+            index_elements=[Issue.__table__.c.fingerprint]
+        )
+        await self.session.execute(stmt)
+        if commit:
+            await self.session.commit()
+
+    @staticmethod
+    def _fold(events: list[EventDB]) -> list[dict]:
+        issues: dict[str, dict] = {}
+        for event in events:
+            issue = issues.get(event.fingerprint)
+            if issue is None:
+                issues[event.fingerprint] = {
+                    "fingerprint": event.fingerprint,
+                    "project_uuid": event.project_uuid,
+                    "type": event.type,
+                    "value": event.value,
+                    "function": event.function,
+                    "module": event.module,
+                    "filename": event.filename,
+                    "first_seen": event.timestamp,
+                    "last_seen": event.timestamp,
+                    "count": 1,
+                }
+                continue
+            issue["count"] += 1
+            issue["first_seen"] = min(issue["first_seen"], event.timestamp)
+            if event.timestamp >= issue["last_seen"]:
+                issue["last_seen"] = event.timestamp
+                issue["value"] = event.value
+        return sorted(issues.values(), key=lambda row: row["fingerprint"])
+
+    async def get_issues_for_user(self, user_id: int, limit: int) -> list[dict]:
+        stmt = (
+            select(Issue.__table__, Project.title.label("project_title"))
+            .join(Project, Project.uuid == Issue.project_uuid)
+            .join(UserProject, UserProject.project_uuid == Project.uuid)
+            .where(UserProject.user_id == user_id)
+            .order_by(Issue.last_seen.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_issues_with_project_title(self, limit: int) -> list[dict]:
+        stmt = (
+            select(Issue.__table__, Project.title.label("project_title"))
+            .join(Project, Project.uuid == Issue.project_uuid)
+            .order_by(Issue.last_seen.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
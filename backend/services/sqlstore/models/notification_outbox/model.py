@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+
+from backend.services.sqlstore.database_init import Base
+
+
+class NotificationOutbox(Base):
+    __tablename__ = "notification_outbox"
+
+    id: int = Column(BigInteger, primary_key=True)
+    notification_id: int = Column(Integer, ForeignKey("notifications.id", ondelete="CASCADE"), nullable=False)
+    # Fully formatted webhook body, so delivery does not depend on the event row.
+    payload: dict = Column(JSONB, nullable=False)
+
+    attempts: int = Column(Integer, nullable=False, default=0)
+    next_attempt_at: datetime = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error: str | None = Column(Text)
+    failed_at: datetime | None = Column(DateTime(timezone=True))
+    created_at: datetime = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    notification = relationship("Notification")
+
+    def __repr__(self) -> str:
+        return f"<NotificationOutbox id={self.id} notification_id={self.notification_id} attempts={self.attempts}>"
+
+
+Index(
+    "ix_notification_outbox_next_attempt_at",
+    NotificationOutbox.next_attempt_at,
+    postgresql_where=NotificationOutbox.failed_at.is_(None),
+)
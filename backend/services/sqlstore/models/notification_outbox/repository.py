@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from sqlalchemy import bindparam, delete, func, select, update
+
+from backend.services.sqlstore.base_repository import SQLAlchemyRepository
+from backend.services.sqlstore.models.notification_outbox.model import NotificationOutbox
+from backend.services.sqlstore.models.notifications.model import Notification
+
+
+class NotificationOutboxRepository(SQLAlchemyRepository):
+    model = NotificationOutbox
+    # JSONB values need SQLAlchemy's serializer, which the raw COPY path bypasses.
+    copy_threshold = float("inf")
+
+    async def enqueue(self, rows: list[dict], commit: bool = True) -> int:
+        """
+        Insert outbox rows whose notification still exists and return how many were kept.
+
+        Routes come from per-worker caches, so a notification deleted through another
+        worker can still be referenced here. Its rows are skipped instead of failing the
+        foreign key and with it the events written in the same transaction. The kept
+        notifications are locked FOR KEY SHARE, so they cannot be deleted before the commit.
+        """
+        if not rows:
+            return 0
+        ids = sorted({row["notification_id"] for row in rows})
+        result = await self.session.execute(
+            select(Notification.id).where(Notification.id.in_(ids)).with_for_update(read=True, key_share=True)
+        )
+        existing = set(result.scalars().all())
+        rows = [row for row in rows if row["notification_id"] in existing]
+        await self.add_many(rows, commit=commit)
+        return len(rows)
+
+    async def claim_batch(self, limit: int, lease: timedelta) -> list[dict]:
+        """
+        Claim up to `limit` due messages for delivery.
+
+        Rows are locked with FOR UPDATE SKIP LOCKED, so concurrent workers never claim the
+        same message, and their next_attempt_at is pushed `lease` into the future. If the
+        claiming worker dies, the messages become due again once the lease runs out.
+        """
+        table = NotificationOutbox.__table__
+        due = (
+            select(table.c.id)
+            .where(table.c.failed_at.is_(None), table.c.next_attempt_at <= func.now())
+            .order_by(table.c.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("due")
+        )
+        stmt = (
+            update(table)
+            .where(table.c.id == due.c.id)
+            .where(Notification.id == table.c.notification_id)
+            .values(next_attempt_at=func.now() + lease, attempts=table.c.attempts + 1)
+            .returning(table.c.id, table.c.payload, table.c.attempts, Notification.type, Notification.url)
+        )
+        result = await self.session.execute(stmt)
+        rows = [dict(row) for row in result.mappings().all()]
+        await self.session.commit()
+        return rows
+
+    async def complete(self, ids: list[int]) -> None:
+        if not ids:
+            return
+        table = NotificationOutbox.__table__
+        await self.session.execute(delete(table).where(table.c.id.in_(ids)))
+        await self.session.commit()
+
+    async def reschedule(self, failures: list[dict]) -> None:
+        """
+        Record failed attempts. Every item holds id, next_attempt_at, last_error and failed_at
+        (set once the message gave up retrying).
+        """
+        if not failures:
+            return
+        table = NotificationOutbox.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("message_id"))
+            .values(
+                next_attempt_at=bindparam("next_attempt_at"),
+                last_error=bindparam("last_error"),
+                failed_at=bindparam("failed_at"),
+            )
+        )
+        await self.session.execute(stmt, [
+            {
+                "message_id": failure["id"],
+                "next_attempt_at": failure["next_attempt_at"],
+                "last_error": failure["last_error"],
+                "failed_at": failure["failed_at"],
+            }
+            for failure in failures
+        ])
+        await self.session.commit()
@@ -23,7 +23,7 @@ class Notification(Base):
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
 
-    project_uuid: str = Column(UUID(as_uuid=False), ForeignKey("projects.uuid"), nullable=False)
+    project_uuid: str = Column(UUID(as_uuid=False), ForeignKey("projects.uuid"), nullable=False, index=True)
 
     project = relationship("Project", back_populates="notifications")
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, Float, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -11,10 +11,15 @@ class Project(Base):
     uuid: str = Column(UUID(as_uuid=False), primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
+    # Ingest limits in events per second; NULL falls back to INGEST_RATE_LIMIT / INGEST_RATE_BURST.
+    rate_limit = Column(Float)
+    rate_burst = Column(Integer)
     user_projects = relationship("UserProject", back_populates="project", cascade="all, delete-orphan",
                                  passive_deletes=True)
     users = relationship("User", secondary="user_projects", viewonly=True)
 
     events = relationship("Event", back_populates="project", cascade="all, delete-orphan")
 
+    issues = relationship("Issue", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+
     notifications = relationship("Notification", back_populates="project", cascade="all, delete-orphan")
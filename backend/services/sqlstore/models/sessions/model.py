@@ -11,8 +11,8 @@ class Session(Base):
     __tablename__ = "sessions"
 
     uuid: str = Column(UUID(as_uuid=False), primary_key=True)
-    user_id: int = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    expires_at: datetime = Column(DateTime(timezone=True), nullable=False)
+    user_id: int = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at: datetime = Column(DateTime(timezone=True), nullable=False, index=True)
     ip_address: str | None = Column(String(45))
     user_agent: str | None = Column(Text)
 
@@ -2,6 +2,7 @@ from sqlalchemy import select
 
 from backend.services.sqlstore.base_repository import SQLAlchemyRepository
 from backend.services.sqlstore.models.sessions.model import Session
+from backend.services.sqlstore.models.users.model import User
 
 
 class SessionRepository(SQLAlchemyRepository):
@@ -12,3 +13,15 @@ class SessionRepository(SQLAlchemyRepository):
             select(Session).where(Session.user_id == user_id)
         )
         return result.scalars().all()
+
+    async def get_user_by_session(self, session_uuid: str):
+        """
+        Return (User, expires_at) for a session in a single joined query, or None.
+        """
+        result = await self.session.execute(
+            select(User, Session.expires_at)
+            .join(Session, Session.user_id == User.id)
+            .where(Session.uuid == session_uuid)
+            .limit(1)
+        )
+        return result.one_or_none()
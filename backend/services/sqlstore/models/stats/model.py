@@ -0,0 +1,79 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, MetaData, String, Table, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.services.sqlstore import timescale
+
+# Kept out of Base.metadata: with TimescaleDB these names are continuous aggregates,
+# otherwise they are plain rollup tables maintained by the ingest buffer.
+stats_metadata = MetaData()
+# Only with TimescaleDB: events dropped by spike protection never reach `events`, so
+# the continuous aggregates miss them and these rollups count them instead.
+dropped_stats_metadata = MetaData()
+
+STATS_RESOLUTIONS = {
+    "minute": "1 minute",
+    "hour": "1 hour",
+}
+
+# Refresh window for each continuous aggregate: (start_offset, end_offset, schedule_interval).
+_REFRESH_POLICIES = {
+    "minute": ("2 hours", "1 minute", "1 minute"),
+    "hour": ("3 days", "1 hour", "30 minutes"),
+}
+
+
+def _stats_table(resolution: str, metadata: MetaData = stats_metadata, suffix: str = "") -> Table:
+    name = f"event_stats_{resolution}{suffix}"
+    return Table(
+        name,
+        metadata,
+        Column("bucket", DateTime(timezone=True), nullable=False),
+        Column("project_uuid", UUID(as_uuid=False), nullable=False),
+        Column("level", String(50)),
+        Column("type", String(255)),
+        Column("events", BigInteger, nullable=False, default=0),
+        Index(f"ux_{name}", "bucket", "project_uuid", "level", "type",
+              unique=True, postgresql_nulls_not_distinct=True),
+    )
+
+
+stats_tables = {resolution: _stats_table(resolution) for resolution in STATS_RESOLUTIONS}
+dropped_stats_tables = {
+    resolution: _stats_table(resolution, dropped_stats_metadata, "_dropped") for resolution in STATS_RESOLUTIONS
+}
+
+
+async def create_event_stats(conn: AsyncConnection) -> None:
+    """
+    Create the per-minute and per-hour event counters.
+
+    With TimescaleDB they are real-time continuous aggregates over `events`, refreshed
+    incrementally by background policies, plus rollup tables for the events spike
+    protection drops. Without it they are rollup tables that the ingest path
+    increments on every flush.
+    """
+    if not timescale.is_enabled():
+        await conn.run_sync(stats_metadata.create_all)
+        return
+
+    await conn.run_sync(dropped_stats_metadata.create_all)
+
+    for resolution, width in STATS_RESOLUTIONS.items():
+        name = stats_tables[resolution].name
+        start_offset, end_offset, schedule_interval = _REFRESH_POLICIES[resolution]
+        await conn.execute(text(
+            f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} "
+            "WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS "
+            f"SELECT time_bucket(INTERVAL '{width}', timestamp) AS bucket, "
+            "project_uuid, level, type, count(*) AS events "
+            "FROM events GROUP BY bucket, project_uuid, level, type "
+            "WITH NO DATA"
+        ))
+        await conn.execute(text(
+            f"SELECT add_continuous_aggregate_policy('{name}', "
+            f"start_offset => INTERVAL '{start_offset}', "
+            f"end_offset => INTERVAL '{end_offset}', "
+            f"schedule_interval => INTERVAL '{schedule_interval}', "
+            "if_not_exists => TRUE)"
+        ))
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from sqlalchemy import Table, func, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.schemas.db.event import EventDB
+from backend.services.sqlstore import timescale
+from backend.services.sqlstore.models.stats.model import dropped_stats_tables, stats_tables
+from backend.services.sqlstore.models.user_projects.model import UserProject
+
+
+class StatsRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def increment(self, events: list[EventDB], commit: bool = True,
+                        tables: dict[str, Table] = stats_tables) -> None:
+        """
+        Add a batch of events to the rollup tables. Without TimescaleDB every event goes
+        to `stats_tables`; with it continuous aggregates maintain themselves and only
+        the events spike protection drops go to `dropped_stats_tables`.
+        """
+        for resolution, table in tables.items():
+            counters: dict[tuple, int] = {}
+            for event in events:
+                bucket = _truncate(event.timestamp, resolution)
+                key = (bucket, event.project_uuid, event.level, event.type)
+                counters[key] = counters.get(key, 0) + 1
+            if not counters:
+                continue
+
+            rows = [
+                {"bucket": bucket, "project_uuid": project_uuid, "level": level, "type": type_, "events": count}
+                for (bucket, project_uuid, level, type_), count in sorted(counters.items(), key=str)
+            ]
+            stmt = pg_insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.bucket, table.c.project_uuid, table.c.level, table.c.type],
+                set_={"events": table.c.events + stmt.excluded.events},
+            )
+            await self.session.execute(stmt)
+        if commit:
+            await self.session.commit()
+
+    async def get_event_counts(self, interval: str, since: datetime, until: datetime,
+                               user_id: int | None = None, project_uuid: str | None = None) -> list[dict]:
+        """
+        Return event counts per (bucket, project, level, type) for the given bucket width.
+
+        Day buckets are summed up from the hourly counters.
+        """
+        resolution = "minute" if interval == "minute" else "hour"
+        table = stats_tables[resolution]
+        if timescale.is_enabled():
+            table = union_all(select(table), select(dropped_stats_tables[resolution])).subquery("stats")
+        if interval == "day":
+            # Literals rather than bind parameters, so the SELECT and GROUP BY expressions are identical.
+            bucket = func.date_trunc(literal_column("'day'"), table.c.bucket, literal_column("'UTC'"))
+        else:
+            bucket = table.c.bucket
+        bucket = bucket.label("bucket")
+
+        stmt = (
+            select(bucket, table.c.project_uuid, table.c.level, table.c.type,
+                   func.sum(table.c.events).label("events"))
+            .where(table.c.bucket >= since, table.c.bucket < until)
+            .group_by(bucket, table.c.project_uuid, table.c.level, table.c.type)
+            .order_by(bucket)
+        )
+        if user_id is not None:
+            stmt = (
+                stmt.join(UserProject, UserProject.project_uuid == table.c.project_uuid)
+                .where(UserProject.user_id == user_id)
+            )
+        if project_uuid is not None:
+            stmt = stmt.where(table.c.project_uuid == project_uuid)
+
+        result = await self.session.execute(stmt)
+        return [
+            {**row, "events": int(row["events"])}
+            for row in result.mappings().all()
+        ]
+
+
+def _truncate(timestamp: datetime, resolution: str) -> datetime:
+    if resolution == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
@@ -10,7 +10,9 @@ class UserProject(Base):
     __tablename__ = "user_projects"
 
     user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
-    project_uuid: str = Column(UUID(as_uuid=False), ForeignKey("projects.uuid", ondelete="CASCADE"), primary_key=True)
+    # user_id lookups use the primary key, project_uuid needs its own index for joins from the project side.
+    project_uuid: str = Column(UUID(as_uuid=False), ForeignKey("projects.uuid", ondelete="CASCADE"), primary_key=True,
+                               index=True)
 
     joined_at: datetime = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
 
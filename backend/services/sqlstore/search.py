@@ -0,0 +1,95 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.services.sqlstore import timescale
+from backend.services.utils.logger import Logger
+
+logger = Logger(__name__)
+
+# The 'simple' configuration does no stemming or stop words, which suits identifiers and code.
+SEARCH_CONFIG = "simple"
+
+
+def search_vector_sql(row: str = "") -> str:
+    """
+    Expression of events.search_vector over the columns of `row` ("NEW." inside the
+    trigger). The exception itself ranks above its location, and the source context lowest.
+    """
+    return (
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({row}type, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({row}value, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        f"coalesce({row}function, '') || ' ' || coalesce({row}filename, '')), 'B') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({row}context, '')), 'D')"
+    )
+
+
+async def enable_pg_trgm(conn: AsyncConnection) -> None:
+    """
+    Load pg_trgm, which the trigram indexes on events need before `create_all` runs.
+    """
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+async def add_search_vector(conn: AsyncConnection) -> None:
+    """
+    Keep events.search_vector filled by a BEFORE INSERT OR UPDATE trigger.
+
+    A trigger rather than a generated column, because TimescaleDB cannot add a
+    generated column to a hypertable that has compression enabled. Tables created
+    before the column existed get it as a plain nullable column, which is allowed on
+    compressed hypertables, and their rows are backfilled once.
+    """
+    exists = await conn.scalar(text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'events' AND column_name = 'search_vector'"
+    ))
+    if not exists:
+        await conn.execute(text("ALTER TABLE events ADD COLUMN search_vector tsvector"))
+
+    await conn.execute(text(
+        "CREATE OR REPLACE FUNCTION events_search_vector() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        f"BEGIN NEW.search_vector := {search_vector_sql('NEW.')}; RETURN NEW; END $$"
+    ))
+    await conn.execute(text("DROP TRIGGER IF EXISTS events_search_vector ON events"))
+    await conn.execute(text(
+        "CREATE TRIGGER events_search_vector "
+        "BEFORE INSERT OR UPDATE OF type, value, function, filename, context ON events "
+        "FOR EACH ROW EXECUTE FUNCTION events_search_vector()"
+    ))
+
+    if not exists:
+        await _backfill(conn)
+
+
+async def _backfill(conn: AsyncConnection) -> None:
+    """
+    Compute search_vector for rows stored before the column existed. Compressed
+    chunks of a hypertable cannot be updated in place, so each one is decompressed,
+    updated and compressed again.
+    """
+    chunks = []
+    if timescale.is_enabled():
+        result = await conn.execute(text(
+            "SELECT chunk_schema, chunk_name, is_compressed FROM timescaledb_information.chunks "
+            "WHERE hypertable_name = 'events' ORDER BY range_start"
+        ))
+        chunks = result.all()
+    if not chunks:
+        logger.warning("Indexing existing events for search, this rewrites the events table once")
+        await conn.execute(text(
+            f"UPDATE events SET search_vector = {search_vector_sql()} WHERE search_vector IS NULL"
+        ))
+        return
+
+    logger.warning(f"Indexing existing events for search in {len(chunks)} chunks, compressed ones are recompressed")
+    quote = conn.dialect.identifier_preparer.quote
+    for schema, name, is_compressed in chunks:
+        chunk = f"{quote(schema)}.{quote(name)}"
+        if is_compressed:
+            await conn.execute(text("SELECT decompress_chunk(CAST(:chunk AS regclass))"), {"chunk": chunk})
+        await conn.execute(text(
+            f"UPDATE {chunk} SET search_vector = {search_vector_sql()} WHERE search_vector IS NULL"
+        ))
+        if is_compressed:
+            await conn.execute(text("SELECT compress_chunk(CAST(:chunk AS regclass))"), {"chunk": chunk})
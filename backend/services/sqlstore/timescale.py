@@ -0,0 +1,95 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.services.utils.config import Config
+from backend.services.utils.logger import Logger
+
+logger = Logger(__name__)
+
+_enabled = False
+
+
+def is_enabled() -> bool:
+    """
+    Return True once `enable_timescale` has found and loaded the timescaledb extension.
+    """
+    return _enabled
+
+
+async def enable_timescale(conn: AsyncConnection) -> bool:
+    """
+    Load the timescaledb extension if the deployment allows it and the server provides it.
+    """
+    global _enabled
+    _enabled = False
+    if not Config.TIMESCALE_ENABLED:
+        return False
+
+    available = await conn.scalar(text("SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'"))
+    if not available:
+        logger.warning("timescaledb extension is not available, events stay a plain table")
+        return False
+
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb"))
+    _enabled = True
+    return True
+
+
+async def setup_events_hypertable(conn: AsyncConnection) -> None:
+    """
+    Turn `events` into a hypertable partitioned on `timestamp` and (re)apply the
+    chunk interval, compression and retention settings from the config.
+
+    Every step is idempotent, so it runs on each startup and picks up config changes.
+    """
+    if not _enabled:
+        return
+
+    await conn.execute(
+        text(
+            "SELECT create_hypertable('events', 'timestamp', "
+            "chunk_time_interval => CAST(:chunk_interval AS interval), "
+            "if_not_exists => TRUE, migrate_data => TRUE)"
+        ),
+        {"chunk_interval": Config.EVENTS_CHUNK_INTERVAL},
+    )
+    await conn.execute(
+        text("SELECT set_chunk_time_interval('events', CAST(:chunk_interval AS interval))"),
+        {"chunk_interval": Config.EVENTS_CHUNK_INTERVAL},
+    )
+
+    compression_enabled = await conn.scalar(
+        text(
+            "SELECT compression_enabled FROM timescaledb_information.hypertables "
+            "WHERE hypertable_name = 'events'"
+        )
+    )
+    if not compression_enabled:
+        await conn.execute(
+            text(
+                "ALTER TABLE events SET ("
+                "timescaledb.compress, "
+                "timescaledb.compress_segmentby = 'project_uuid', "
+                "timescaledb.compress_orderby = 'timestamp DESC')"
+            )
+        )
+
+    await conn.execute(text("SELECT remove_compression_policy('events', if_exists => TRUE)"))
+    if Config.EVENTS_COMPRESS_AFTER:
+        await conn.execute(
+            text("SELECT add_compression_policy('events', CAST(:compress_after AS interval))"),
+            {"compress_after": Config.EVENTS_COMPRESS_AFTER},
+        )
+
+    await conn.execute(text("SELECT remove_retention_policy('events', if_exists => TRUE)"))
+    if Config.EVENTS_RETENTION:
+        await conn.execute(
+            text("SELECT add_retention_policy('events', CAST(:retention AS interval))"),
+            {"retention": Config.EVENTS_RETENTION},
+        )
+
+    logger.info(
+        f"events hypertable ready: chunk {Config.EVENTS_CHUNK_INTERVAL}, "
+        f"compress after {Config.EVENTS_COMPRESS_AFTER or 'never'}, "
+        f"retention {Config.EVENTS_RETENTION or 'forever'}"
+    )
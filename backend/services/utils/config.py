@@ -18,3 +18,45 @@ class Config:
     BACKEND_PROTOCOL = os.getenv("BACKEND_PROTOCOL")
     BACKEND_HOST = os.getenv("BACKEND_HOST")
     BACKEND_PORT = int(os.getenv("BACKEND_PORT"))
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_COPY_THRESHOLD = int(os.getenv("DB_COPY_THRESHOLD", 1000))
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 500))
+    INGEST_MAX_LATENCY = float(os.getenv("INGEST_MAX_LATENCY", 0.5))
+    INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", 50000))
+    TIMESCALE_ENABLED = os.getenv("TIMESCALE_ENABLED", "true").lower() == "true"
+    EVENTS_CHUNK_INTERVAL = os.getenv("EVENTS_CHUNK_INTERVAL", "1 day")
+    EVENTS_COMPRESS_AFTER = os.getenv("EVENTS_COMPRESS_AFTER", "7 days")
+    EVENTS_RETENTION = os.getenv("EVENTS_RETENTION", "")
+    AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+    AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 60))
+    NOTIFICATION_ROUTES_CACHE_SIZE = int(os.getenv("NOTIFICATION_ROUTES_CACHE_SIZE", 10000))
+    NOTIFICATION_ROUTES_TTL = float(os.getenv("NOTIFICATION_ROUTES_TTL", 300))
+    WEBHOOK_CONNECTION_LIMIT = int(os.getenv("WEBHOOK_CONNECTION_LIMIT", 100))
+    WEBHOOK_LIMIT_PER_HOST = int(os.getenv("WEBHOOK_LIMIT_PER_HOST", 10))
+    WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", 5))
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 100))
+    OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 1))
+    OUTBOX_LEASE = float(os.getenv("OUTBOX_LEASE", 60))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 10))
+    OUTBOX_RETRY_BASE_DELAY = float(os.getenv("OUTBOX_RETRY_BASE_DELAY", 5))
+    OUTBOX_RETRY_MAX_DELAY = float(os.getenv("OUTBOX_RETRY_MAX_DELAY", 3600))
+    NOTIFICATION_COALESCE_WINDOW = float(os.getenv("NOTIFICATION_COALESCE_WINDOW", 300))
+    NOTIFICATION_COALESCE_MAX_WINDOWS = int(os.getenv("NOTIFICATION_COALESCE_MAX_WINDOWS", 100000))
+    PROJECT_KEYS_REFRESH_INTERVAL = float(os.getenv("PROJECT_KEYS_REFRESH_INTERVAL", 30))
+    INGEST_RATE_LIMIT = float(os.getenv("INGEST_RATE_LIMIT", 0))
+    INGEST_RATE_BURST = int(os.getenv("INGEST_RATE_BURST", 100))
+    SPIKE_PROTECTION_LIMIT = int(os.getenv("SPIKE_PROTECTION_LIMIT", 100))
+    SPIKE_PROTECTION_WINDOW = int(os.getenv("SPIKE_PROTECTION_WINDOW", 60))
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", 2))
+    BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", 64))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 2000))
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 5000))
+    IMPORT_MAX_SIZE = int(os.getenv("IMPORT_MAX_SIZE", 2 * 1024 ** 3))
+    IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", 100))
+    IMPORT_MAX_LINE_SIZE = int(os.getenv("IMPORT_MAX_LINE_SIZE", 20 * 1024 ** 2))
+    ENVELOPE_MAX_SIZE = int(os.getenv("ENVELOPE_MAX_SIZE", 20 * 1024 * 1024))
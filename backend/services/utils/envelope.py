@@ -0,0 +1,315 @@
+import json
+import time
+import zlib
+from typing import AsyncIterator, Iterator
+
+from fastapi import Request
+
+from backend.services.utils.config import Config
+from backend.services.utils.metrics import DECOMPRESS_SECONDS
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional codec
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional codec
+    zstandard = None
+
+DECOMPRESS_CHUNK_SIZE = 64 * 1024
+# A zstd block of a few bytes can expand to 128 KiB, so input is fed in small slices
+# to keep the output of one step around 2 MiB at worst.
+ZSTD_INPUT_STEP = 64
+
+
+class EnvelopeError(ValueError):
+    pass
+
+
+class EnvelopeTooLarge(EnvelopeError):
+    pass
+
+
+class UnsupportedEncoding(EnvelopeError):
+    pass
+
+
+class LineTooLong(EnvelopeError):
+    pass
+
+
+class _Identity:
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        yield data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _Zlib:
+    """
+    Incremental gzip/deflate decoder that never inflates more than `DECOMPRESS_CHUNK_SIZE`
+    bytes per step, so a decompression bomb is caught by the size limit early.
+    """
+
+    def __init__(self, wbits: int):
+        self._decompressor = zlib.decompressobj(wbits)
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        out = self._decompressor.decompress(data, DECOMPRESS_CHUNK_SIZE)
+        while out:
+            yield out
+            out = self._decompressor.decompress(self._decompressor.unconsumed_tail, DECOMPRESS_CHUNK_SIZE)
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
+
+
+class _Brotli:
+    """
+    Incremental brotli decoder whose output buffer never grows past `DECOMPRESS_CHUNK_SIZE`.
+    """
+
+    def __init__(self):
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        out = self._decompressor.process(data, output_buffer_limit=DECOMPRESS_CHUNK_SIZE)
+        # Once the limit is hit the rest is drained with empty input.
+        while out or not self._decompressor.can_accept_more_data():
+            yield out
+            out = self._decompressor.process(b"", output_buffer_limit=DECOMPRESS_CHUNK_SIZE)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _Zstd:
+    """
+    Incremental zstd decoder. The stream writer hands over output in pieces of at most
+    `DECOMPRESS_CHUNK_SIZE` bytes, and input goes in `ZSTD_INPUT_STEP` byte slices
+    because one call decodes everything it is given.
+    """
+
+    def __init__(self):
+        self._output = []
+        self._decompressor = zstandard.ZstdDecompressor().stream_writer(
+            self, write_size=DECOMPRESS_CHUNK_SIZE, closefd=False,
+        )
+
+    def write(self, data: bytes) -> int:
+        self._output.append(bytes(data))
+        return len(data)
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        view = memoryview(data)
+        for start in range(0, len(view), ZSTD_INPUT_STEP):
+            self._decompressor.write(view[start:start + ZSTD_INPUT_STEP])
+            output, self._output = self._output, []
+            yield from output
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def get_decompressor(content_encoding: str | None):
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding in ("identity", ""):
+        return _Identity()
+    if encoding in ("gzip", "x-gzip"):
+        return _Zlib(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        # Auto-detects a zlib or gzip header.
+        return _Zlib(32 + zlib.MAX_WBITS)
+    if encoding == "br" and brotli is not None:
+        return _Brotli()
+    if encoding == "zstd" and zstandard is not None:
+        return _Zstd()
+    raise UnsupportedEncoding(f"Unsupported content-encoding: {encoding}")
+
+
+async def iter_decompressed(chunks: AsyncIterator[bytes], content_encoding: str | None,
+                            max_size: int) -> AsyncIterator[bytes]:
+    """
+    Decompress a byte stream incrementally, failing once more than `max_size`
+    decompressed bytes have been produced.
+    """
+    decompressor = get_decompressor(content_encoding)
+    total = 0
+    # Only the time spent inside the decompressor, not waiting for the body or the consumer.
+    elapsed = 0.0
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            steps = decompressor.decompress(chunk)
+            while True:
+                started = time.perf_counter()
+                data = next(steps, None)
+                elapsed += time.perf_counter() - started
+                if data is None:
+                    break
+                total += len(data)
+                if total > max_size:
+                    raise EnvelopeTooLarge(f"Envelope exceeds {max_size} bytes")
+                if data:
+                    yield data
+        started = time.perf_counter()
+        data = decompressor.flush()
+        elapsed += time.perf_counter() - started
+    except EnvelopeError:
+        raise
+    except Exception as e:
+        raise EnvelopeError(f"Cannot decompress envelope: {e}") from e
+    DECOMPRESS_SECONDS.labels((content_encoding or "identity").strip().lower() or "identity").observe(elapsed)
+    total += len(data)
+    if total > max_size:
+        raise EnvelopeTooLarge(f"Envelope exceeds {max_size} bytes")
+    if data:
+        yield data
+
+
+class EnvelopeReader:
+    """
+    Buffered reader over a decompressed byte stream that only keeps
+    the current line or item payload in memory.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._buffer = bytearray()
+        self._eof = False
+
+    async def _fill(self) -> bool:
+        if self._eof:
+            return False
+        try:
+            self._buffer += await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            return False
+        return True
+
+    async def readline(self, max_size: int | None = None) -> bytes | None:
+        """
+        Return the next line without its trailing newline, or None at the end of the stream.
+
+        A line longer than `max_size` bytes is skipped without being buffered and
+        LineTooLong is raised; the reader then continues with the following line.
+        """
+        start = 0
+        while True:
+            index = self._buffer.find(b"\n", start)
+            if index != -1:
+                if max_size is not None and index > max_size:
+                    del self._buffer[:index + 1]
+                    raise LineTooLong(f"Line exceeds {max_size} bytes")
+                line = bytes(self._buffer[:index])
+                del self._buffer[:index + 1]
+                return line
+            if max_size is not None and len(self._buffer) > max_size:
+                await self._skip_line()
+                raise LineTooLong(f"Line exceeds {max_size} bytes")
+            start = len(self._buffer)
+            if not await self._fill():
+                if not self._buffer:
+                    return None
+                line = bytes(self._buffer)
+                self._buffer.clear()
+                return line
+
+    async def _skip_line(self) -> None:
+        while (index := self._buffer.find(b"\n")) == -1:
+            self._buffer.clear()
+            if not await self._fill():
+                return
+        del self._buffer[:index + 1]
+
+    async def readexactly(self, length: int) -> bytes:
+        while len(self._buffer) < length:
+            if not await self._fill():
+                raise EnvelopeError("Envelope item is shorter than its declared length")
+        data = bytes(self._buffer[:length])
+        del self._buffer[:length]
+        return data
+
+    async def skip_newline(self) -> None:
+        if not self._buffer:
+            await self._fill()
+        if self._buffer[:1] == b"\n":
+            del self._buffer[:1]
+
+
+def _loads(data: bytes, what: str) -> dict:
+    try:
+        value = json.loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise EnvelopeError(f"Invalid {what}: {e}") from e
+    if not isinstance(value, dict):
+        raise EnvelopeError(f"Invalid {what}: expected an object")
+    return value
+
+
+async def iter_items(reader: EnvelopeReader) -> AsyncIterator[dict]:
+    """
+    Lazily yield envelope items as {"item_header": ..., "payload": ...}.
+
+    Items with a `length` header are read byte-exact, so binary or multi-line payloads
+    do not desync the parser. Payloads that are not JSON are returned as raw bytes.
+    """
+    while True:
+        line = await reader.readline()
+        if line is None:
+            return
+        if not line.strip():
+            continue
+        item_header = _loads(line, "item header")
+
+        length = item_header.get("length")
+        if length is not None:
+            if not isinstance(length, int) or length < 0:
+                raise EnvelopeError(f"Invalid item length: {length!r}")
+            raw_payload = await reader.readexactly(length)
+            await reader.skip_newline()
+        else:
+            raw_payload = await reader.readline()
+            if raw_payload is None:
+                return
+
+        try:
+            payload = json.loads(raw_payload)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            payload = raw_payload
+        yield {
+            "item_header": item_header,
+            "payload": payload,
+        }
+
+
+async def read_envelope(request: Request, max_size: int | None = None) -> tuple[dict, AsyncIterator[dict]] | None:
+    """
+    Read the envelope header from a streamed request body.
+
+    Returns:
+        tuple[dict, AsyncIterator[dict]] | None: The envelope header and a lazy iterator
+        over its items, or None for an empty body.
+
+    Raises:
+        EnvelopeError: On malformed input; EnvelopeTooLarge and UnsupportedEncoding
+        are raised for oversized bodies and unknown content encodings.
+    """
+    chunks = iter_decompressed(
+        request.stream(),
+        request.headers.get("content-encoding"),
+        max_size or Config.ENVELOPE_MAX_SIZE,
+    )
+    reader = EnvelopeReader(chunks)
+
+    line = await reader.readline()
+    while line is not None and not line.strip():
+        line = await reader.readline()
+    if line is None:
+        return None
+    return _loads(line, "envelope header"), iter_items(reader)
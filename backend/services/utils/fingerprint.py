@@ -0,0 +1,46 @@
+import hashlib
+import re
+
+FINGERPRINT_FRAMES = 3
+
+_NORMALIZERS = (
+    (re.compile(r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"0x[0-9a-fA-F]+"), "<hex>"),
+    (re.compile(r"\d+(\.\d+)?"), "<num>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+)
+
+
+def normalize_message(message: str | None) -> str:
+    """
+    Strip the volatile parts of an exception message (ids, addresses, numbers,
+    quoted values) so that occurrences of the same error group together.
+    """
+    if not message:
+        return ""
+    for pattern, replacement in _NORMALIZERS:
+        message = pattern.sub(replacement, message)
+    return message.strip()
+
+
+def get_fingerprint(project_uuid: str, exception_type: str | None, message: str | None,
+                    frames: list[dict]) -> str:
+    """
+    Return a stable grouping key for an event.
+
+    The key covers the project, the exception type, the normalized message and the
+    module/function of the innermost `FINGERPRINT_FRAMES` frames. Line numbers are left
+    out on purpose so that unrelated edits to the file keep the same issue.
+    """
+    parts = [project_uuid or "", exception_type or "", normalize_message(message)]
+    for frame in frames[-FINGERPRINT_FRAMES:]:
+        parts.append(f"{frame.get('module') or ''}:{frame.get('function') or ''}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def get_custom_fingerprint(project_uuid: str, values: list) -> str:
+    """
+    Return a grouping key for an explicit fingerprint sent by the SDK.
+    """
+    parts = [project_uuid or "", *(str(value) for value in values)]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
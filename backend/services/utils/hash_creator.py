@@ -1,9 +1,48 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from backend.services.utils.config import Config
+
+# bcrypt releases the GIL while hashing, so a few threads keep the event loop free
+# without letting a login burst take every core away from ingestion.
+_executor = ThreadPoolExecutor(max_workers=Config.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_pending = 0
+
+
+async def _run(func, *args):
+    """
+    Run a bcrypt call on the hashing pool.
+
+    Raises:
+        asyncio.QueueFull: If `BCRYPT_MAX_PENDING` calls are already queued or running.
+    """
+    global _pending
+    if _pending >= Config.BCRYPT_MAX_PENDING:
+        raise asyncio.QueueFull("Password hashing queue is full")
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _pending -= 1
+
 
-def get_password_hash(password: str) -> bytes:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+def hash_password_sync(password: str) -> bytes:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS))
 
 
-def check_password(password: str, hashed_password: bytes) -> bool:
+def check_password_sync(password: str, hashed_password: bytes) -> bool:
     return bcrypt.checkpw(password.encode(), hashed_password)
+
+
+async def get_password_hash(password: str) -> bytes:
+    return await _run(hash_password_sync, password)
+
+
+async def check_password(password: str, hashed_password: bytes) -> bool:
+    return await _run(check_password_sync, password, hashed_password)
+
+
+def shutdown_executor() -> None:
+    _executor.shutdown(wait=True)
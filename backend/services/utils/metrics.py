@@ -0,0 +1,122 @@
+"""
+Prometheus metrics of the ingest path, the database pool and webhook delivery.
+
+Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR (set before
+this module is imported, see backend/gunicorn.conf.py) and `render` merges the files of
+all workers, so whichever worker serves /metrics reports totals for the whole server.
+Without that variable the process-local default registry is used.
+
+/metrics is not authenticated, so projects are labelled with `project_label`, never
+with their key.
+"""
+import hashlib
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+
+def project_label(project_uuid: str) -> str:
+    """
+    Return a stable, non-secret label for a project. The project uuid doubles as its
+    DSN key, so only the first 12 hex digits of its SHA-256 are exposed.
+    """
+    return hashlib.sha256(project_uuid.encode()).hexdigest()[:12]
+
+
+ENVELOPES = Counter(
+    "ingest_envelopes_total",
+    "Envelopes received, by project and outcome",
+    ["project", "outcome"],
+)
+EVENTS_PARSED = Counter(
+    "ingest_events_parsed_total",
+    "Events parsed from accepted envelopes",
+    ["project"],
+)
+PARSE_SECONDS = Histogram(
+    "ingest_envelope_parse_seconds",
+    "Time to read, decompress and parse one envelope",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DECOMPRESS_SECONDS = Histogram(
+    "ingest_decompress_seconds",
+    "Time spent decompressing one request body",
+    ["encoding"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+DB_FLUSH_SECONDS = Histogram(
+    "ingest_db_flush_seconds",
+    "Time to write one batch of events to the database",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_ROWS = Counter(
+    "ingest_db_rows_total",
+    "Events handed to the database by the ingest buffer, by outcome",
+    ["outcome"],
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size",
+    multiprocess_mode="livesum",
+)
+WEBHOOK_SECONDS = Histogram(
+    "webhook_send_seconds",
+    "Webhook request latency, by notification type",
+    ["type"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+WEBHOOK_FAILURES = Counter(
+    "webhook_failures_total",
+    "Webhook requests that failed, by notification type",
+    ["type"],
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, by method, route template and status",
+    ["method", "route", "status"],
+)
+
+
+def instrument_pool(pool) -> None:
+    """
+    Keep the pool gauges current from checkout/checkin events, so every worker
+    reports its own pool without being scraped itself.
+    """
+    checked_out = 0
+
+    def update(delta: int) -> None:
+        nonlocal checked_out
+        checked_out += delta
+        POOL_CHECKED_OUT.set(checked_out)
+        # Overflow connections are only kept while more than pool_size are in use.
+        POOL_OVERFLOW.set(max(0, checked_out - pool.size()))
+
+    event.listen(pool, "checkout", lambda *args: update(1))
+    event.listen(pool, "checkin", lambda *args: update(-1))
+
+
+def render() -> tuple[bytes, str]:
+    """
+    Return the exposition body and its content type.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
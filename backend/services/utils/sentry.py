@@ -1,72 +1,144 @@
-import gzip
-import json
 from datetime import datetime, timezone
-from io import BytesIO
+from urllib.parse import urlsplit
+
 from fastapi import Request
 from pydantic import ValidationError
 
 from backend.schemas.db.event import EventDB
+from backend.services.ingest.project_keys import normalize_key, project_keys
+from backend.services.ingest.rate_limit import rate_limiter
+from backend.services.utils.envelope import read_envelope
+from backend.services.utils.fingerprint import get_custom_fingerprint, get_fingerprint
 from backend.services.utils.logger import Logger
 from backend.services.utils.uuid_creator import get_uuid
 
 logger = Logger(__name__)
 
+EVENT_ITEM_TYPES = ("event", "error")
+
+
+class UnknownProject(Exception):
+    pass
+
+
+class RateLimited(Exception):
+    def __init__(self, project_uuid: str, retry_after: float):
+        super().__init__(f"Project {project_uuid} is over its rate limit, retry after {retry_after:.1f}s")
+        self.project_uuid = project_uuid
+        self.retry_after = retry_after
+
 
 class Sentry:
 
     @staticmethod
     async def parse_as_json(request: Request) -> dict | None:
-        compressed_data = await request.body()
-        if request.headers.get("content-encoding") == "gzip":
-            with gzip.GzipFile(fileobj=BytesIO(compressed_data)) as f:
-                raw_data = f.read().decode('utf-8')
-        else:
-            raw_data = compressed_data.decode('utf-8')
-        lines = raw_data.strip().split('\n')
-        if not lines:
+        envelope = await read_envelope(request)
+        if not envelope:
             return None
-        envelope = {}
-        envelope_header = json.loads(lines[0])
-        envelope['envelope_headers'] = envelope_header
-        items = []
-        i = 1
-        while i < len(lines):
-            item_header = json.loads(lines[i])
-            i += 1
-            if i >= len(lines):
-                break
-            payload_line = lines[i]
-            i += 1
-            try:
-                payload = json.loads(payload_line)
-            except json.JSONDecodeError:
-                payload = payload_line
-            items.append({
-                'item_header': item_header,
-                'payload': payload
-            })
-        envelope['items'] = items
-        return envelope
+        envelope_headers, items = envelope
+        return {
+            "envelope_headers": envelope_headers,
+            "items": [item async for item in items],
+        }
 
     @staticmethod
-    async def parse_as_model(request: Request) -> EventDB | None:
-        event_json = await Sentry.parse_as_json(request)
-        if not event_json:
+    async def parse_as_models(request: Request) -> list[EventDB] | None:
+        """
+        Parse every event item of an envelope into an `EventDB`.
+
+        Items are dispatched by `item_header.type`; sessions, client reports,
+        attachments and other non-event items are skipped.
+
+        The project key is checked against the registry and the project's rate limit
+        before any item is read: from the X-Sentry-Auth header or `sentry_key` query
+        parameter before the body is touched, otherwise from the envelope header.
+
+        Returns:
+            list[EventDB] | None: The parsed events (possibly empty), or None for an empty body.
+
+        Raises:
+            UnknownProject: If the key does not belong to a project, or the auth and
+            envelope keys disagree.
+            RateLimited: If the project has no tokens left.
+        """
+        auth_key = Sentry.get_auth_key(request)
+        if auth_key is not None:
+            if not project_keys.is_known(auth_key):
+                raise UnknownProject(f"Unknown project key {auth_key}")
+            Sentry.check_rate_limit(auth_key)
+
+        envelope = await read_envelope(request)
+        if not envelope:
             return None
-        try:
-            envelope_headers = event_json.get("envelope_headers", {})
-            first_item = event_json["items"][0]
-            payload = first_item["payload"]
+        envelope_headers, items = envelope
+
+        public_key = Sentry.get_public_key(envelope_headers)
+        if auth_key is None:
+            if not project_keys.is_known(public_key):
+                raise UnknownProject(f"Unknown project key {public_key}")
+            Sentry.check_rate_limit(public_key)
+        elif public_key is not None and normalize_key(public_key) != normalize_key(auth_key):
+            raise UnknownProject(f"Envelope key {public_key} does not match auth key {auth_key}")
+        project_uuid = normalize_key(auth_key or public_key)
+
+        events = []
+        async for item in items:
+            item_type = item["item_header"].get("type")
+            if item_type not in EVENT_ITEM_TYPES:
+                logger.debug(f"Skipping envelope item of type {item_type}")
+                continue
+            event = Sentry.event_from_payload(envelope_headers, item["payload"], project_uuid)
+            if event:
+                events.append(event)
+        # The envelope itself paid for one event on admission.
+        rate_limiter.charge(project_uuid, len(events) - 1)
+        return events
 
-            exc = payload["exception"]["values"][0]
-            frame = exc["stacktrace"]["frames"][0]
+    @staticmethod
+    def check_rate_limit(key: str) -> None:
+        project_uuid = normalize_key(key)
+        retry_after = rate_limiter.acquire(project_uuid, *project_keys.get_limits(project_uuid))
+        if retry_after:
+            raise RateLimited(project_uuid, retry_after)
+
+    @staticmethod
+    def get_auth_key(request: Request) -> str | None:
+        """
+        Return the `sentry_key` sent in the X-Sentry-Auth header or the query string.
+        """
+        auth = request.headers.get("x-sentry-auth")
+        if auth:
+            if auth.lower().startswith("sentry "):
+                auth = auth[len("sentry "):]
+            for part in auth.split(","):
+                name, _, value = part.strip().partition("=")
+                if name == "sentry_key" and value:
+                    return value
+        return request.query_params.get("sentry_key") or None
+
+    @staticmethod
+    def get_public_key(envelope_headers: dict) -> str | None:
+        public_key = (envelope_headers.get("trace") or {}).get("public_key")
+        if not public_key and envelope_headers.get("dsn"):
+            public_key = urlsplit(envelope_headers["dsn"]).username
+        return public_key
+
+    @staticmethod
+    def event_from_payload(envelope_headers: dict, payload: dict, project_uuid: str | None = None) -> EventDB | None:
+        try:
+            exceptions = (payload.get("exception") or {}).get("values") or [{}]
+            # The last value is the exception that was actually raised, earlier ones are its causes.
+            exc = exceptions[-1]
+            frames = (exc.get("stacktrace") or {}).get("frames") or [{}]
+            # Frames go from the outermost call to the one that raised.
+            frame = frames[-1]
 
             pre_ctx = frame.get("pre_context", [])
             ctx_line = frame.get("context_line", "")
             post_ctx = frame.get("post_context", [])
             context = "\n".join([*pre_ctx, ctx_line, *post_ctx])
 
-            start_line = frame.get("lineno", 0) - len(pre_ctx)
+            start_line = (frame.get("lineno") or 0) - len(pre_ctx)
 
             runtime = payload.get("contexts", {}).get("runtime", {})
             rt_name, rt_ver, rt_build = (
@@ -75,9 +147,22 @@ class Sentry:
                 runtime.get("build"),
             )
 
+            value = exc.get("value")
+            if value is None:
+                logentry = payload.get("logentry") or {}
+                value = logentry.get("formatted") or logentry.get("message") or payload.get("message")
+
+            project_uuid = project_uuid or Sentry.get_public_key(envelope_headers)
+            custom_fingerprint = payload.get("fingerprint")
+            if custom_fingerprint and "{{ default }}" not in custom_fingerprint:
+                fingerprint = get_custom_fingerprint(project_uuid, custom_fingerprint)
+            else:
+                fingerprint = get_fingerprint(project_uuid, exc.get("type"), value, frames)
+
             event_data = {
                 "uuid": get_uuid(),
-                "project_uuid": envelope_headers.get("trace", {}).get("public_key"),
+                "project_uuid": project_uuid,
+                "fingerprint": fingerprint,
 
                 "context": context,
                 "start_line": start_line,
@@ -86,12 +171,10 @@ class Sentry:
                 # TODO: сделать его динамическим
                 "level": "unmarked",
 
-                "timestamp": datetime.fromisoformat(
-                    payload["timestamp"].replace("Z", "+00:00")
-                ).astimezone(timezone.utc),
+                "timestamp": Sentry.parse_timestamp(payload["timestamp"]),
 
                 "type": exc.get("type"),
-                "value": exc.get("value"),
+                "value": value,
 
                 "filename": frame.get("filename"),
                 "abs_path": frame.get("abs_path"),
@@ -109,6 +192,12 @@ class Sentry:
 
             return EventDB(**event_data)
 
-        except (KeyError, IndexError, TypeError, ValueError, ValidationError):
-            logger.error("Error in parse_as_model")
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError, ValidationError):
+            logger.error("Error in event_from_payload")
             return None
+
+    @staticmethod
+    def parse_timestamp(value: str | int | float) -> datetime:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value, tz=timezone.utc)
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
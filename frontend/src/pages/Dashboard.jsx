@@ -55,6 +55,7 @@ export default function Dashboard({userRole}) {
         try {
             setLoading(true);
             const response = await axios.get('http://127.0.0.1:8039/api/events', {
+                params: {limit: 1000},
                 withCredentials: true
             });
             setIssues(response.data);
@@ -52,6 +52,7 @@ export default function Issues({userRole}) {
         try {
             setLoading(true);
             const response = await axios.get('http://127.0.0.1:8039/api/events', {
+                params: {limit: 1000},
                 withCredentials: true,
             });
             setEvents(response.data);
@@ -100,9 +101,18 @@ export default function Issues({userRole}) {
         setSelectedProjects(selectedProjectUuids);
     };
 
-    const handleEventClick = (event) => {
+    const handleEventClick = async (event) => {
         setSelectedEvent(event);
         setIsModalVisible(true);
+        try {
+            const response = await axios.get(`http://127.0.0.1:8039/api/events/${event.uuid}`, {
+                withCredentials: true,
+            });
+            setSelectedEvent(response.data);
+        } catch (error) {
+            console.error('Error fetching event:', error);
+            message.error('Ошибка загрузки события');
+        }
     };
 
     const handleCloseModal = () => {